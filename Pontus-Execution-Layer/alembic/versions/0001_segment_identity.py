@@ -0,0 +1,68 @@
+"""Unique segment identity for the ON CONFLICT upsert
+
+Revision ID: 0001_segment_identity
+Revises:
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_segment_identity'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only when run from the alembic CLI before init_db has created the schema;
+    # create_all will then build the table with this change already applied
+    if not sa.inspect(op.get_bind()).has_table("route_segments"):
+        return
+
+    # Postgres never treats NULLs as conflicting, so a nullable provider
+    # would let those rows bypass the upsert and pile up on every refresh
+    op.execute("UPDATE route_segments SET provider = '' WHERE provider IS NULL")
+    op.alter_column(
+        "route_segments", "provider",
+        existing_type=sa.String(100), nullable=False, server_default="",
+    )
+
+    # Keep only the newest row per identity before adding the constraint
+    op.execute("""
+        DELETE FROM route_segments
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY provider, segment_type, from_asset, to_asset
+                    ORDER BY timestamp DESC NULLS LAST,
+                             updated_at DESC NULLS LAST,
+                             created_at DESC NULLS LAST
+                ) AS rn
+                FROM route_segments
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'uq_segment_identity'
+            ) THEN
+                ALTER TABLE route_segments ADD CONSTRAINT uq_segment_identity
+                    UNIQUE (provider, segment_type, from_asset, to_asset);
+            END IF;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE route_segments DROP CONSTRAINT IF EXISTS uq_segment_identity")
+    op.alter_column(
+        "route_segments", "provider",
+        existing_type=sa.String(100), nullable=True, server_default=None,
+    )
@@ -0,0 +1,38 @@
+"""Composite (segment_type, timestamp) index for the segment listing
+
+Revision ID: 0002_segment_type_ts_index
+Revises: 0001_segment_identity
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_segment_type_ts_index'
+down_revision = '0001_segment_identity'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only when run from the alembic CLI before init_db has created the schema;
+    # create_all will then build the table with this change already applied
+    if not sa.inspect(op.get_bind()).has_table("route_segments"):
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_segment_type_ts "
+        "ON route_segments (segment_type, timestamp)"
+    )
+    # segment_type now leads idx_segment_lookup and idx_segment_type_ts
+    op.execute("DROP INDEX IF EXISTS ix_route_segments_segment_type")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_route_segments_segment_type "
+        "ON route_segments (segment_type)"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_segment_type_ts")
@@ -2,8 +2,10 @@
 Route Execution API Endpoints
 """
 from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from pydantic import BaseModel
+import logging
 
 from app.services.execution.execution_service import ExecutionService
 from app.schemas.execution import (
@@ -14,8 +16,8 @@ from app.schemas.execution import (
     CancelExecutionRequest,
     ModifyTransactionRequest
 )
-from app.middleware.rate_limit import limiter
-from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/routes", tags=["execution"])
 
@@ -47,8 +49,37 @@ class ExecuteRouteRequest(BaseModel):
     enable_ai_rerouting: bool = True  # Enable AI-based dynamic re-routing
 
 
+def _to_route_request(execute_request: ExecuteRouteRequest) -> RouteExecutionRequest:
+    """Validate and normalize an execute request body"""
+    if not execute_request.from_asset or not execute_request.to_asset:
+        raise HTTPException(
+            status_code=400,
+            detail="from_asset and to_asset are required"
+        )
+    
+    if execute_request.amount <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Amount must be greater than 0"
+        )
+    
+    return RouteExecutionRequest(
+        from_asset=execute_request.from_asset.strip().upper(),
+        to_asset=execute_request.to_asset.strip().upper(),
+        amount=execute_request.amount,
+        from_network=execute_request.from_network.strip().lower() if execute_request.from_network else None,
+        to_network=execute_request.to_network.strip().lower() if execute_request.to_network else None,
+        use_cplex=execute_request.use_cplex,
+        cost_weight=max(0.0, execute_request.cost_weight),
+        latency_weight=max(0.0, execute_request.latency_weight),
+        reliability_weight=max(0.0, execute_request.reliability_weight),
+        alpha=max(0.0, min(1.0, execute_request.alpha)),
+        beta=max(0.0, min(1.0, execute_request.beta)),
+        gamma=max(0.0, min(1.0, execute_request.gamma))
+    )
+
+
 @router.post("/execute")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def execute_route(request: Request, execute_request: ExecuteRouteRequest):
     """
     Execute a route from source to destination.
@@ -67,34 +98,8 @@ async def execute_route(request: Request, execute_request: ExecuteRouteRequest):
         )
     
     try:
-        # Input validation
-        if not execute_request.from_asset or not execute_request.to_asset:
-            raise HTTPException(
-                status_code=400,
-                detail="from_asset and to_asset are required"
-            )
-        
-        if execute_request.amount <= 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Amount must be greater than 0"
-            )
-        
-        # Convert to RouteExecutionRequest
-        route_request = RouteExecutionRequest(
-            from_asset=execute_request.from_asset.strip().upper(),
-            to_asset=execute_request.to_asset.strip().upper(),
-            amount=execute_request.amount,
-            from_network=execute_request.from_network.strip().lower() if execute_request.from_network else None,
-            to_network=execute_request.to_network.strip().lower() if execute_request.to_network else None,
-            use_cplex=execute_request.use_cplex,
-            cost_weight=max(0.0, execute_request.cost_weight),
-            latency_weight=max(0.0, execute_request.latency_weight),
-            reliability_weight=max(0.0, execute_request.reliability_weight),
-            alpha=max(0.0, min(1.0, execute_request.alpha)),
-            beta=max(0.0, min(1.0, execute_request.beta)),
-            gamma=max(0.0, min(1.0, execute_request.gamma))
-        )
+        # Validate and convert to RouteExecutionRequest
+        route_request = _to_route_request(execute_request)
         
         # Execute route with advanced features
         result = await execution_service.execute_route(
@@ -114,8 +119,47 @@ async def execute_route(request: Request, execute_request: ExecuteRouteRequest):
         raise HTTPException(status_code=500, detail="Internal server error during execution")
 
 
+@router.post("/execute/stream")
+async def execute_route_stream(request: Request, execute_request: ExecuteRouteRequest):
+    """
+    Execute a route, streaming progress as newline-delimited JSON.
+    
+    Emits one `{"event": "segment", "data": {...}}` line per completed segment,
+    then a final `{"event": "result", "data": {...}}` line with the execution
+    summary (segment results are not repeated there).
+    
+    **Note:** This is a simulation - no real transactions are executed.
+    """
+    if not execution_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Execution service not initialized"
+        )
+    
+    route_request = _to_route_request(execute_request)
+    try:
+        # Reject bad input before the 200 + stream headers go out
+        execution_service.validate_request(route_request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def stream():
+        async for item in execution_service.execute_route_iter(
+            route_request,
+            parallel=execute_request.parallel,
+            enable_ai_rerouting=execute_request.enable_ai_rerouting,
+            validated=True
+        ):
+            if isinstance(item, RouteExecutionResponse):
+                data = item.model_dump_json(exclude={"segment_executions"})
+                yield b'{"event":"result","data":' + data.encode() + b'}\n'
+            else:
+                yield b'{"event":"segment","data":' + item.model_dump_json().encode() + b'}\n'
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get("/execute")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def execute_route_get(
     request: Request,
     from_asset: str = Query(..., description="Source currency/asset"),
@@ -157,7 +201,6 @@ async def execute_route_get(
 
 
 @router.get("/execute/{execution_id}/status")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_execution_status(
     request: Request,
     execution_id: str
@@ -207,7 +250,6 @@ async def get_execution_status(
 
 
 @router.get("/wallet/{wallet_address}/balance")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_wallet_balance(
     request: Request,
     wallet_address: str,
@@ -238,7 +280,6 @@ async def get_wallet_balance(
 
 
 @router.get("/transaction/{tx_hash}/status")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_transaction_status(
     request: Request,
     tx_hash: str
@@ -272,7 +313,6 @@ async def get_transaction_status(
 
 
 @router.post("/execute/{execution_id}/pause")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def pause_execution(
     request: Request,
     execution_id: str
@@ -292,7 +332,6 @@ async def pause_execution(
 
 
 @router.post("/execute/{execution_id}/resume")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def resume_execution(
     request: Request,
     execution_id: str
@@ -312,7 +351,6 @@ async def resume_execution(
 
 
 @router.post("/execute/{execution_id}/cancel")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def cancel_execution(
     request: Request,
     execution_id: str,
@@ -331,7 +369,6 @@ async def cancel_execution(
 
 
 @router.post("/execute/{execution_id}/reroute")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def reroute_execution(
     request: Request,
     execution_id: str,
@@ -353,7 +390,6 @@ async def reroute_execution(
 
 
 @router.post("/execute/{execution_id}/modify")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def modify_transaction(
     request: Request,
     execution_id: str,
@@ -9,8 +9,6 @@ import statistics
 
 from app.services.aggregator_service import AggregatorService
 from app.services.routing_service import RoutingService
-from app.middleware.rate_limit import limiter
-from app.config import settings
 import logging
 import random
 
@@ -83,7 +81,6 @@ class MicroHedgePosition(BaseModel):
 
 
 @router.get("/rates")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_fx_rates(
     request: Request,
     pairs: Optional[str] = Query(None, description="Comma-separated pairs (e.g., USD/EUR,USD/GBP)")
@@ -248,7 +245,6 @@ async def get_fx_rates(
 
 
 @router.get("/rates/history")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_fx_rate_history(
     request: Request,
     pair: str = Query(..., description="Currency pair (e.g., USD/EUR)"),
@@ -326,7 +322,6 @@ async def get_fx_rate_history(
 
 
 @router.get("/optimal-time")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_optimal_time(
     request: Request,
     from_currency: str = Query(..., description="Source currency"),
@@ -388,7 +383,6 @@ async def get_optimal_time(
 
 
 @router.get("/cost-forecast")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_cost_forecast(request: Request):
     """Get predictive cost forecasting for gas, bridge fees, and FX liquidity"""
     if not aggregator_service:
@@ -448,7 +442,6 @@ async def get_cost_forecast(request: Request):
 
 
 @router.get("/micro-hedge")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_micro_hedge_position(request: Request):
     """Get current micro-hedging position using stablecoins"""
     # Simulated data - in production, fetch from wallet balances
@@ -461,7 +454,6 @@ async def get_micro_hedge_position(request: Request):
 
 
 @router.get("/sources")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_fx_sources(request: Request):
     """Get list of FX rate sources"""
     if not aggregator_service:
@@ -491,7 +483,6 @@ async def get_fx_sources(request: Request):
 
 
 @router.get("/compare")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def compare_fx_rates(
     request: Request,
     pair: str = Query(..., description="Currency pair (e.g., USD/EUR)"),
@@ -8,8 +8,6 @@ from pydantic import BaseModel
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
 from app.schemas.route_segment import RouteSegment
-from app.middleware.rate_limit import limiter
-from app.config import settings
 
 router = APIRouter(prefix="/api/routes", tags=["optimization"])
 
@@ -45,7 +43,6 @@ class RouteRequest(BaseModel):
 
 
 @router.post("/optimize")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def optimize_route(request: Request, route_request: RouteRequest):
     """
     Find optimal route from source to destination.
@@ -108,7 +105,6 @@ async def optimize_route(request: Request, route_request: RouteRequest):
 
 
 @router.get("/optimize")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def optimize_route_get(
     request: Request,
     from_asset: str = Query(..., description="Source currency/asset"),
@@ -172,7 +168,6 @@ async def optimize_route_get(
 
 
 @router.get("/compare")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def compare_routes(
     request: Request,
     from_asset: str = Query(..., description="Source currency/asset"),
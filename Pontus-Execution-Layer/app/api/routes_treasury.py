@@ -9,8 +9,6 @@ import uuid
 
 from app.services.aggregator_service import AggregatorService
 from app.services.routing_service import RoutingService
-from app.middleware.rate_limit import limiter
-from app.config import settings
 
 router = APIRouter(prefix="/api/treasury", tags=["treasury"])
 
@@ -87,7 +85,6 @@ class PayoutForecast(BaseModel):
 
 
 @router.get("/balances")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_unified_balances(request: Request):
     """
     Get unified balances across all sources (banks, Wise, exchanges, wallets).
@@ -192,7 +189,6 @@ async def get_unified_balances(request: Request):
 
 
 @router.get("/fx-rates")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_fx_rates(request: Request):
     """Get real-time FX rates"""
     if not aggregator_service:
@@ -220,7 +216,6 @@ async def get_fx_rates(request: Request):
 
 
 @router.get("/gas-prices")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_gas_prices(request: Request):
     """Get real-time gas prices for different networks"""
     if not aggregator_service:
@@ -246,7 +241,6 @@ async def get_gas_prices(request: Request):
 
 
 @router.get("/liquidity")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_liquidity_data(request: Request):
     """Get liquidity data for different assets and networks"""
     if not aggregator_service:
@@ -274,7 +268,6 @@ async def get_liquidity_data(request: Request):
 
 
 @router.get("/rebalancing-rules")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_rebalancing_rules(request: Request):
     """Get active rebalancing rules"""
     # Simulated rebalancing rules
@@ -315,7 +308,6 @@ async def get_rebalancing_rules(request: Request):
 
 
 @router.get("/cash-positioning")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_cash_positioning(request: Request):
     """Get cash positioning recommendations"""
     recommendations = [
@@ -341,7 +333,6 @@ async def get_cash_positioning(request: Request):
 
 
 @router.get("/payout-forecast")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_payout_forecast(request: Request, days: int = Query(30, description="Number of days to forecast")):
     """Get payout forecast for upcoming period"""
     # Simulated payout forecasts
@@ -364,7 +355,6 @@ async def get_payout_forecast(request: Request, days: int = Query(30, descriptio
 
 
 @router.get("/optimal-time")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_optimal_time(
     request: Request,
     from_asset: str = Query(..., description="Source asset"),
@@ -408,7 +398,6 @@ async def get_optimal_time(
 
 
 @router.get("/corridor-liquidity")
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def get_corridor_liquidity(
     request: Request,
     from_currency: str = Query(..., description="Source currency"),
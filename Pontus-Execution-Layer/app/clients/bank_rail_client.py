@@ -21,8 +21,6 @@ class BankRailClient(BaseClient):
     }
     
     async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
-        
         # Common bank rail routes
         routes = [
             ("USD", "EUR"), ("EUR", "USD"),
@@ -39,11 +37,7 @@ class BankRailClient(BaseClient):
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
-        
-        return segments
+        return [result for result in results if isinstance(result, RouteSegment)]
     
     async def _fetch_wise(self, from_curr: str, to_curr: str) -> RouteSegment:
         """Fetch from Wise calculator - API endpoint may not be publicly available"""
@@ -5,7 +5,7 @@ from datetime import datetime
 
 
 class BaseClient:
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.client = client
     
     async def fetch_segments(self) -> List[RouteSegment]:
@@ -25,7 +25,12 @@ class BaseClient:
         from_network: Optional[str] = None,
         to_network: Optional[str] = None,
     ) -> RouteSegment:
-        """Helper to create normalized RouteSegment"""
+        """
+        Helper to create normalized RouteSegment
+        
+        The cost/latency/constraints dicts are copied by pydantic validation and
+        never mutated, so callers may pass shared module-level constants.
+        """
         return RouteSegment(
             segment_type=segment_type,
             from_asset=from_asset,
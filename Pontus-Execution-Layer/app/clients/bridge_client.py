@@ -10,8 +10,6 @@ class BridgeClient(BaseClient):
     """Fetches bridge quotes from Socket and LI.FI"""
     
     async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
-        
         # Common bridge routes
         routes = [
             ("ethereum", "polygon", "USDC", "USDC"),
@@ -27,11 +25,7 @@ class BridgeClient(BaseClient):
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
-        
-        return segments
+        return [result for result in results if isinstance(result, RouteSegment)]
     
     async def _fetch_socket(self, from_net: str, to_net: str, from_asset: str, to_asset: str) -> RouteSegment:
         """Fetch from Socket API"""
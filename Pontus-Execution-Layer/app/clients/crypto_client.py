@@ -10,8 +10,6 @@ class CryptoClient(BaseClient):
     """Fetches crypto prices from CoinGecko and exchanges"""
     
     async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
-        
         # Common crypto pairs
         pairs = [
             ("BTC", "USD"), ("ETH", "USD"), ("USDC", "USD"),
@@ -26,11 +24,7 @@ class CryptoClient(BaseClient):
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
-        
-        return segments
+        return [result for result in results if isinstance(result, RouteSegment)]
     
     async def _fetch_coingecko(self, from_asset: str, to_asset: str) -> RouteSegment:
         """Fetch from CoinGecko"""
@@ -10,8 +10,6 @@ class GasClient(BaseClient):
     """Fetches gas fees from Etherscan and Polygonscan"""
     
     async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
-        
         tasks = [
             self._fetch_etherscan(),
             self._fetch_polygonscan(),
@@ -20,11 +18,7 @@ class GasClient(BaseClient):
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
-        
-        return segments
+        return [result for result in results if isinstance(result, RouteSegment)]
     
     async def _fetch_etherscan(self) -> RouteSegment:
         """Fetch Ethereum gas prices using Etherscan API V2"""
@@ -2,13 +2,14 @@
 Kraken API Client
 Handles cryptocurrency exchange operations via Kraken API
 """
+import asyncio
 import httpx
 import hmac
 import hashlib
 import base64
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from urllib.parse import urlencode
 
 from app.clients.base_client import BaseClient
@@ -17,6 +18,33 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Map assets to Kraken symbols
+_ASSET_MAP = {
+    "USD": "USD",
+    "USDT": "USDT",
+    "USDC": "USDC",
+    "BTC": "XBT",  # Kraken uses XBT for Bitcoin
+    "ETH": "ETH",
+    "EUR": "EUR",
+    "GBP": "GBP"
+}
+
+# (from_kraken, to_kraken) -> (pair, order type)
+# Common pairs: XBTUSD, ETHUSD, etc. Buying spends USD, selling receives USD.
+_SWAP_ROUTES = {
+    ("USD", "XBT"): ("XBTUSD", "buy"),
+    ("USD", "ETH"): ("ETHUSD", "buy"),
+    ("USD", "USDT"): ("USDTUSD", "buy"),
+    ("USD", "USDC"): ("USDCUSD", "buy"),
+    ("XBT", "USD"): ("XBTUSD", "sell"),
+    ("ETH", "USD"): ("ETHUSD", "sell"),
+    ("USDT", "USD"): ("USDTUSD", "sell"),
+    ("USDC", "USD"): ("USDCUSD", "sell"),
+}
+
+# Shared across segments; normalize_segment copies it during validation
+_KRAKEN_LATENCY = {"min_minutes": 1, "max_minutes": 5}
+
 
 class KrakenClient(BaseClient):
     """Kraken API client for cryptocurrency operations"""
@@ -31,13 +59,16 @@ class KrakenClient(BaseClient):
         if not self.api_key or not self.private_key:
             logger.warning("Kraken API credentials not configured")
     
-    def _sign_message(self, url_path: str, data: Dict[str, Any]) -> str:
+    def _sign_message(self, url_path: str, data: Dict[str, Any]) -> Tuple[str, bytes]:
         """
         Sign a message using Kraken's API signature method
         
         Args:
             url_path: API endpoint path (e.g., "/0/private/Balance")
             data: Request data as dictionary
+        
+        Returns:
+            Tuple of (signature, form-encoded body bytes that were signed)
         """
         if not self.private_key:
             raise ValueError("Kraken private key not configured")
@@ -46,10 +77,16 @@ class KrakenClient(BaseClient):
         nonce = str(int(time.time() * 1000))
         data["nonce"] = nonce
         
-        # Encode data
+        # Encode data once; the same bytes are sent as the request body
         post_data = urlencode(data)
-        encoded = (str(data["nonce"]) + post_data).encode()
-        message = url_path.encode() + hashlib.sha256(encoded).digest()
+        encoded = (nonce + post_data).encode()
+        
+        # hashlib.new() dispatches straight to OpenSSL (>= 1.1.1 assumed), which
+        # uses the CPU SHA extensions where available. The digest is only an
+        # input to the HMAC below, so it is not used for security on its own.
+        sha = hashlib.new("sha256", usedforsecurity=False)
+        sha.update(encoded)
+        message = url_path.encode() + sha.digest()
         
         # Decode private key
         secret = base64.b64decode(self.private_key)
@@ -58,18 +95,25 @@ class KrakenClient(BaseClient):
         signature = hmac.new(secret, message, hashlib.sha512)
         sigdigest = base64.b64encode(signature.digest())
         
-        return sigdigest.decode()
+        return sigdigest.decode(), post_data.encode()
     
-    def _get_headers(self, url_path: str, data: Dict[str, Any]) -> Dict[str, str]:
-        """Get authentication headers for Kraken API"""
+    def _sign_and_encode(self, url_path: str, data: Dict[str, Any]) -> Tuple[Dict[str, str], bytes]:
+        """
+        Get authentication headers and the signed request body for Kraken API
+        
+        Sending the exact bytes that were signed avoids a second form encoding
+        by httpx, which could otherwise differ from urlencode (e.g. booleans).
+        """
         if not self.api_key:
             raise ValueError("Kraken API key not configured")
         
-        signature = self._sign_message(url_path, data)
-        return {
+        signature, body = self._sign_message(url_path, data)
+        headers = {
             "API-Key": self.api_key,
-            "API-Sign": signature
+            "API-Sign": signature,
+            "Content-Type": "application/x-www-form-urlencoded"
         }
+        return headers, body
     
     async def get_account_balance(self) -> Dict[str, float]:
         """Get account balance for all assets"""
@@ -81,12 +125,12 @@ class KrakenClient(BaseClient):
             url = f"{self.BASE_URL}{url_path}"
             data = {}
             
-            headers = self._get_headers(url_path, data)
+            headers, body = self._sign_and_encode(url_path, data)
             
             response = await self.client.post(
                 url,
                 headers=headers,
-                data=data,
+                content=body,
                 timeout=30.0
             )
             response.raise_for_status()
@@ -127,6 +171,40 @@ class KrakenClient(BaseClient):
             logger.error(f"Error fetching Kraken ticker: {e}")
             return None
     
+    async def get_tickers(self, pairs: List[str]) -> Dict[str, Any]:
+        """
+        Get ticker information for several trading pairs in one request
+        
+        Args:
+            pairs: Trading pairs (e.g., ["XBTUSD", "ETHUSD"])
+        
+        Returns:
+            Dict of ticker data keyed by Kraken's canonical pair name (e.g., "XXBTZUSD"),
+            or by the requested pair name when the batch had to be split
+        """
+        try:
+            url = f"{self.BASE_URL}/0/public/Ticker"
+            params = {"pair": ",".join(pairs)}
+            
+            response = await self.client.get(url, params=params, timeout=10.0)
+            response.raise_for_status()
+            result = response.json()
+            
+            if result.get("error"):
+                # Kraken rejects the whole batch if any one pair is unknown (EQuery:Unknown
+                # asset pair); ask per pair so only the bad one is lost
+                if len(pairs) > 1 and any(str(err).startswith("EQuery") for err in result["error"]):
+                    logger.warning(f"Kraken batch ticker rejected ({result['error']}), fetching pairs individually")
+                    tickers = await asyncio.gather(*(self.get_ticker(pair) for pair in pairs))
+                    return {pair: ticker for pair, ticker in zip(pairs, tickers) if ticker}
+                logger.error(f"Kraken API error: {result['error']}")
+                return {}
+            
+            return result.get("result", {})
+        except Exception as e:
+            logger.error(f"Error fetching Kraken tickers: {e}")
+            return {}
+    
     async def get_asset_pairs(self) -> Dict[str, Any]:
         """Get all available trading pairs"""
         try:
@@ -189,12 +267,12 @@ class KrakenClient(BaseClient):
             if price:
                 data["price"] = str(price)
             
-            headers = self._get_headers(url_path, data)
+            headers, body = self._sign_and_encode(url_path, data)
             
             response = await self.client.post(
                 url,
                 headers=headers,
-                data=data,
+                content=body,
                 timeout=30.0
             )
             response.raise_for_status()
@@ -224,12 +302,12 @@ class KrakenClient(BaseClient):
                 "trades": True
             }
             
-            headers = self._get_headers(url_path, data)
+            headers, body = self._sign_and_encode(url_path, data)
             
             response = await self.client.post(
                 url,
                 headers=headers,
-                data=data,
+                content=body,
                 timeout=30.0
             )
             response.raise_for_status()
@@ -263,12 +341,12 @@ class KrakenClient(BaseClient):
                 "txid": txid
             }
             
-            headers = self._get_headers(url_path, data)
+            headers, body = self._sign_and_encode(url_path, data)
             
             response = await self.client.post(
                 url,
                 headers=headers,
-                data=data,
+                content=body,
                 timeout=30.0
             )
             response.raise_for_status()
@@ -341,42 +419,25 @@ class KrakenClient(BaseClient):
         if not self.api_key or not self.private_key:
             raise ValueError("Kraken API credentials not configured")
         
-        # Map assets to Kraken symbols
-        asset_map = {
-            "USD": "USD",
-            "USDT": "USDT",
-            "USDC": "USDC",
-            "BTC": "XBT",  # Kraken uses XBT for Bitcoin
-            "ETH": "ETH",
-            "EUR": "EUR",
-            "GBP": "GBP"
-        }
+        from_kraken = _ASSET_MAP.get(from_asset.upper(), from_asset.upper())
+        to_kraken = _ASSET_MAP.get(to_asset.upper(), to_asset.upper())
+        
+        # Unknown combinations fall back to the direct pair (default buy, may need adjustment)
+        pair, order_type = _SWAP_ROUTES.get(
+            (from_kraken, to_kraken), (f"{from_kraken}{to_kraken}", "buy")
+        )
         
-        from_kraken = asset_map.get(from_asset.upper(), from_asset.upper())
-        to_kraken = asset_map.get(to_asset.upper(), to_asset.upper())
-        
-        # Determine trading pair
-        # Common pairs: XBTUSD, ETHUSD, etc.
-        if from_kraken == "USD" and to_kraken in ["XBT", "ETH", "USDT", "USDC"]:
-            pair = f"{to_kraken}USD"
-            order_type = "buy"
-        elif to_kraken == "USD" and from_kraken in ["XBT", "ETH", "USDT", "USDC"]:
-            pair = f"{from_kraken}USD"
-            order_type = "sell"
-            # For sell, volume is in base currency
-            volume = amount
-        else:
-            # Try direct pair
-            pair = f"{from_kraken}{to_kraken}"
-            order_type = "buy"  # Default, may need adjustment
+        # Sell volume is in base currency; buy amount is in quote currency
+        volume = amount if order_type == "sell" else None
+        amt = amount if order_type == "buy" else None
         
         # Create market order
         order_result = await self.create_order(
             pair=pair,
             type=order_type,
             ordertype="market",
-            volume=volume if order_type == "sell" else None,
-            amount=amount if order_type == "buy" else None
+            volume=volume,
+            amount=amt
         )
         
         if not order_result:
@@ -403,41 +464,46 @@ class KrakenClient(BaseClient):
         if not self.api_key:
             return segments
         
-        # Common trading pairs to fetch
+        # Common trading pairs to fetch: (from, to, request pair, canonical result key)
         pairs = [
-            ("BTC", "USD", "XBTUSD"),
-            ("ETH", "USD", "ETHUSD"),
-            ("USDT", "USD", "USDTUSD"),
-            ("USDC", "USD", "USDCUSD"),
+            ("BTC", "USD", "XBTUSD", "XXBTZUSD"),
+            ("ETH", "USD", "ETHUSD", "XETHZUSD"),
+            ("USDT", "USD", "USDTUSD", "USDTZUSD"),
+            ("USDC", "USD", "USDCUSD", "USDCUSD"),
         ]
         
-        for from_asset, to_asset, kraken_pair in pairs:
+        tickers = await self.get_tickers([kraken_pair for _, _, kraken_pair, _ in pairs])
+        
+        # Current price (last trade price) per pair; a malformed entry only drops its own pair
+        prices = {}
+        for kp, v in tickers.items():
             try:
-                ticker = await self.get_ticker(kraken_pair)
-                if ticker:
-                    # Get current price (last trade price)
-                    price = float(ticker.get("c", [0])[0]) if ticker.get("c") else None
-                    
-                    if price:
-                        # Calculate fee (Kraken typically charges 0.16-0.26% for maker/taker)
-                        fee_percent = 0.2  # Average fee
-                        
-                        segments.append(self.normalize_segment(
-                            segment_type=SegmentType.CRYPTO,
-                            from_asset=from_asset,
-                            to_asset=to_asset,
-                            cost={
-                                "fee_percent": fee_percent,
-                                "fixed_fee": 0.0,
-                                "effective_fx_rate": price if from_asset == "USD" else 1.0 / price
-                            },
-                            latency={"min_minutes": 1, "max_minutes": 5},
-                            reliability_score=0.95,
-                            provider="kraken"
-                        ))
-            except Exception as e:
-                logger.debug(f"Error fetching Kraken ticker for {kraken_pair}: {e}")
+                if v.get("c"):
+                    prices[kp] = float(v["c"][0])
+            except (AttributeError, TypeError, ValueError, IndexError) as e:
+                logger.debug(f"Error parsing Kraken ticker {kp}: {e}")
+        
+        # Calculate fee (Kraken typically charges 0.16-0.26% for maker/taker)
+        fee_percent = 0.2  # Average fee
+        
+        for from_asset, to_asset, kraken_pair, result_key in pairs:
+            price = prices.get(result_key) or prices.get(kraken_pair)
+            if not price:
                 continue
+            
+            segments.append(self.normalize_segment(
+                segment_type=SegmentType.CRYPTO,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                cost={
+                    "fee_percent": fee_percent,
+                    "fixed_fee": 0.0,
+                    "effective_fx_rate": price if from_asset == "USD" else 1.0 / price
+                },
+                latency=_KRAKEN_LATENCY,
+                reliability_score=0.95,
+                provider="kraken"
+            ))
         
         return segments
 
@@ -5,13 +5,14 @@ from app.clients.base_client import BaseClient
 from app.schemas.route_segment import RouteSegment, SegmentType
 from app.config import settings
 
+# Shared across segments; normalize_segment copies it during validation
+_UNISWAP_LATENCY = {"min_minutes": 0, "max_minutes": 1}
+
 
 class LiquidityClient(BaseClient):
     """Fetches liquidity data from 0x and Uniswap subgraph"""
     
     async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
-        
         # Common liquidity pairs (prioritize high liquidity pairs)
         pairs = [
             ("WETH", "USDC", "ethereum"),  # Highest liquidity pair
@@ -27,11 +28,7 @@ class LiquidityClient(BaseClient):
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
-        
-        return segments
+        return [result for result in results if isinstance(result, RouteSegment)]
     
     async def _fetch_zerox(self, from_asset: str, to_asset: str, network: str) -> RouteSegment:
         """Fetch from 0x API - tries multiple approaches"""
@@ -181,7 +178,7 @@ class LiquidityClient(BaseClient):
                             "fixed_fee": 0.0,
                             "effective_fx_rate": price
                         },
-                        latency={"min_minutes": 0, "max_minutes": 1},
+                        latency=_UNISWAP_LATENCY,
                         reliability_score=liquidity_score,
                         provider="uniswap_subgraph",
                         constraints={"liquidity_score": liquidity_score, "tvl_usd": tvl}
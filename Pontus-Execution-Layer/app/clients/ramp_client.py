@@ -1,207 +1,218 @@
 import httpx
 import asyncio
-from typing import List
+from typing import List, Dict, Any, AsyncIterator
 from app.clients.base_client import BaseClient
 from app.schemas.route_segment import RouteSegment, SegmentType
+from app.infra.redis_client import cached_fetch
+from app.infra import singleflight
+from app.infra.http_client import retry_transient
 from app.config import settings
 
+# Common ramp routes: (from_asset, to_asset, network)
+_ON_RAMP_ROUTES = (
+    ("USD", "USDC", "ethereum"),
+    ("USD", "USDT", "ethereum"),
+    ("EUR", "USDC", "polygon"),
+)
+
+_OFF_RAMP_ROUTES = (
+    ("USDC", "USD", "ethereum"),
+    ("USDT", "USD", "ethereum"),
+    ("USDC", "EUR", "polygon"),
+)
+
+# Upper bound per quote so one slow upstream can't hold back the rest
+_QUOTE_TIMEOUT = 8.0
+
 
 class RampClient(BaseClient):
     """Fetches on/off-ramp quotes from Transak and Onmeta"""
     
-    async def fetch_segments(self) -> List[RouteSegment]:
-        segments = []
+    TRANSAK_ONRAMP_URL = "https://api.transak.com/api/v2/currencies/crypto-currencies"
+    TRANSAK_OFFRAMP_URL = "https://api.transak.com/api/v2/currencies/fiat-currencies"
+    ONMETA_ONRAMP_URL = "https://api.onmeta.in/v1/onramp/quote"
+    ONMETA_OFFRAMP_URL = "https://api.onmeta.in/v1/offramp/quote"
+    
+    def __init__(self, client: httpx.AsyncClient):
+        super().__init__(client)
+        self._transak_key = settings.transak_api_key
+        self._onmeta_key = settings.onmeta_api_key
         
-        # Common ramp routes
-        on_ramp_routes = [
-            ("USD", "USDC", "ethereum"),
-            ("USD", "USDT", "ethereum"),
-            ("EUR", "USDC", "polygon"),
+        # Request headers only depend on the keys, so build them once
+        self._transak_headers = {"apiKey": self._transak_key} if self._transak_key else {}
+        self._onmeta_headers = {"Content-Type": "application/json"}
+        if self._onmeta_key:
+            self._onmeta_headers["x-api-key"] = self._onmeta_key
+    
+    async def fetch_segments(self) -> List[RouteSegment]:
+        return [segment async for segment in self.iter_segments()]
+    
+    async def iter_segments(self) -> AsyncIterator[RouteSegment]:
+        """Yield ramp segments as each quote arrives instead of waiting for the slowest"""
+        tasks = [
+            fetch(from_asset, to_asset, network)
+            for from_asset, to_asset, network in _ON_RAMP_ROUTES
+            for fetch in (self._fetch_transak_onramp, self._fetch_onmeta_onramp)
         ]
-        
-        off_ramp_routes = [
-            ("USDC", "USD", "ethereum"),
-            ("USDT", "USD", "ethereum"),
-            ("USDC", "EUR", "polygon"),
+        tasks += [
+            fetch(from_asset, to_asset, network)
+            for from_asset, to_asset, network in _OFF_RAMP_ROUTES
+            for fetch in (self._fetch_transak_offramp, self._fetch_onmeta_offramp)
         ]
         
-        tasks = []
-        for from_asset, to_asset, network in on_ramp_routes:
-            tasks.append(self._fetch_transak_onramp(from_asset, to_asset, network))
-            tasks.append(self._fetch_onmeta_onramp(from_asset, to_asset, network))
-        
-        for from_asset, to_asset, network in off_ramp_routes:
-            tasks.append(self._fetch_transak_offramp(from_asset, to_asset, network))
-            tasks.append(self._fetch_onmeta_offramp(from_asset, to_asset, network))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, RouteSegment):
-                segments.append(result)
+        for fut in asyncio.as_completed([asyncio.wait_for(t, timeout=_QUOTE_TIMEOUT) for t in tasks]):
+            try:
+                yield await fut
+            except Exception:
+                # Failed or timed-out quotes are skipped
+                continue
+    
+    async def _get_quote(self, cache_key: str, url: str, params: Dict[str, Any], headers: Dict[str, str]) -> Any:
+        """GET a ramp quote, served from Redis within settings.redis_ttl"""
+        @retry_transient
+        async def fetch():
+            response = await self.client.get(url, params=params, headers=headers, timeout=10.0)
+            response.raise_for_status()
+            return response.json()
         
-        return segments
+        # Coalesce concurrent identical lookups so a cache miss hits upstream once
+        return await singleflight.do(
+            cache_key, lambda: cached_fetch(cache_key, settings.redis_ttl, fetch)
+        )
     
     async def _fetch_transak_onramp(self, from_asset: str, to_asset: str, network: str) -> RouteSegment:
         """Fetch Transak on-ramp quote"""
-        try:
-            url = "https://api.transak.com/api/v2/currencies/crypto-currencies"
-            params = {
-                "fiatCurrency": from_asset,
-                "cryptoCurrency": to_asset,
-                "network": network,
-            }
-            
-            headers = {}
-            if settings.transak_api_key:
-                headers["apiKey"] = settings.transak_api_key
-            
-            response = await self.client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract fee information (simplified)
-            fee_percent = 1.0  # Default estimate
-            if "response" in data and isinstance(data["response"], list) and len(data["response"]) > 0:
-                crypto_data = data["response"][0]
-                fee_percent = float(crypto_data.get("fees", {}).get("transakFee", 1.0))
-            
-            return self.normalize_segment(
-                segment_type=SegmentType.ON_RAMP,
-                from_asset=from_asset,
-                to_asset=to_asset,
-                from_network=None,
-                to_network=network,
-                cost={
-                    "fee_percent": fee_percent,
-                    "fixed_fee": 0.0,
-                    "effective_fx_rate": None
-                },
-                latency={"min_minutes": 5, "max_minutes": 30},
-                reliability_score=0.85,
-                provider="transak"
-            )
-        except Exception as e:
-            pass
-        return None
+        params = {
+            "fiatCurrency": from_asset,
+            "cryptoCurrency": to_asset,
+            "network": network,
+        }
+        
+        data = await self._get_quote(
+            f"ramp:transak:onramp:{from_asset}:{to_asset}:{network}",
+            self.TRANSAK_ONRAMP_URL,
+            params,
+            self._transak_headers
+        )
+        
+        # Extract fee information (simplified)
+        fee_percent = 1.0  # Default estimate
+        if "response" in data and isinstance(data["response"], list) and len(data["response"]) > 0:
+            crypto_data = data["response"][0]
+            fee_percent = float(crypto_data.get("fees", {}).get("transakFee", 1.0))
+        
+        return self.normalize_segment(
+            segment_type=SegmentType.ON_RAMP,
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_network=None,
+            to_network=network,
+            cost={
+                "fee_percent": fee_percent,
+                "fixed_fee": 0.0,
+                "effective_fx_rate": None
+            },
+            latency={"min_minutes": 5, "max_minutes": 30},
+            reliability_score=0.85,
+            provider="transak"
+        )
     
     async def _fetch_transak_offramp(self, from_asset: str, to_asset: str, network: str) -> RouteSegment:
         """Fetch Transak off-ramp quote"""
-        try:
-            url = "https://api.transak.com/api/v2/currencies/fiat-currencies"
-            params = {
-                "cryptoCurrency": from_asset,
-                "fiatCurrency": to_asset,
-                "network": network,
-            }
-            
-            headers = {}
-            if settings.transak_api_key:
-                headers["apiKey"] = settings.transak_api_key
-            
-            response = await self.client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            
-            return self.normalize_segment(
-                segment_type=SegmentType.OFF_RAMP,
-                from_asset=from_asset,
-                to_asset=to_asset,
-                from_network=network,
-                to_network=None,
-                cost={
-                    "fee_percent": 1.5,  # Default estimate
-                    "fixed_fee": 0.0,
-                    "effective_fx_rate": None
-                },
-                latency={"min_minutes": 10, "max_minutes": 60},
-                reliability_score=0.85,
-                provider="transak"
-            )
-        except Exception as e:
-            pass
-        return None
+        params = {
+            "cryptoCurrency": from_asset,
+            "fiatCurrency": to_asset,
+            "network": network,
+        }
+        
+        await self._get_quote(
+            f"ramp:transak:offramp:{from_asset}:{to_asset}:{network}",
+            self.TRANSAK_OFFRAMP_URL,
+            params,
+            self._transak_headers
+        )
+        
+        return self.normalize_segment(
+            segment_type=SegmentType.OFF_RAMP,
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_network=network,
+            to_network=None,
+            cost={
+                "fee_percent": 1.5,  # Default estimate
+                "fixed_fee": 0.0,
+                "effective_fx_rate": None
+            },
+            latency={"min_minutes": 10, "max_minutes": 60},
+            reliability_score=0.85,
+            provider="transak"
+        )
     
     async def _fetch_onmeta_onramp(self, from_asset: str, to_asset: str, network: str) -> RouteSegment:
         """Fetch Onmeta on-ramp quote (test mode)"""
-        try:
-            url = "https://api.onmeta.in/v1/onramp/quote"
-            params = {
-                "fiatCurrency": from_asset,
-                "cryptoCurrency": to_asset,
-                "network": network,
-                "amount": "100",
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-            }
-            if settings.onmeta_api_key:
-                headers["x-api-key"] = settings.onmeta_api_key
-            
-            response = await self.client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            fee_percent = float(data.get("fee", {}).get("percentage", 1.5))
-            
-            return self.normalize_segment(
-                segment_type=SegmentType.ON_RAMP,
-                from_asset=from_asset,
-                to_asset=to_asset,
-                from_network=None,
-                to_network=network,
-                cost={
-                    "fee_percent": fee_percent,
-                    "fixed_fee": 0.0,
-                    "effective_fx_rate": None
-                },
-                latency={"min_minutes": 5, "max_minutes": 30},
-                reliability_score=0.80,
-                provider="onmeta"
-            )
-        except Exception as e:
-            pass
-        return None
+        params = {
+            "fiatCurrency": from_asset,
+            "cryptoCurrency": to_asset,
+            "network": network,
+            "amount": "100",
+        }
+        
+        data = await self._get_quote(
+            f"ramp:onmeta:onramp:{from_asset}:{to_asset}:{network}",
+            self.ONMETA_ONRAMP_URL,
+            params,
+            self._onmeta_headers
+        )
+        
+        fee_percent = float(data.get("fee", {}).get("percentage", 1.5))
+        
+        return self.normalize_segment(
+            segment_type=SegmentType.ON_RAMP,
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_network=None,
+            to_network=network,
+            cost={
+                "fee_percent": fee_percent,
+                "fixed_fee": 0.0,
+                "effective_fx_rate": None
+            },
+            latency={"min_minutes": 5, "max_minutes": 30},
+            reliability_score=0.80,
+            provider="onmeta"
+        )
     
     async def _fetch_onmeta_offramp(self, from_asset: str, to_asset: str, network: str) -> RouteSegment:
         """Fetch Onmeta off-ramp quote (test mode)"""
-        try:
-            url = "https://api.onmeta.in/v1/offramp/quote"
-            params = {
-                "cryptoCurrency": from_asset,
-                "fiatCurrency": to_asset,
-                "network": network,
-                "amount": "100",
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-            }
-            if settings.onmeta_api_key:
-                headers["x-api-key"] = settings.onmeta_api_key
-            
-            response = await self.client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            fee_percent = float(data.get("fee", {}).get("percentage", 2.0))
-            
-            return self.normalize_segment(
-                segment_type=SegmentType.OFF_RAMP,
-                from_asset=from_asset,
-                to_asset=to_asset,
-                from_network=network,
-                to_network=None,
-                cost={
-                    "fee_percent": fee_percent,
-                    "fixed_fee": 0.0,
-                    "effective_fx_rate": None
-                },
-                latency={"min_minutes": 15, "max_minutes": 90},
-                reliability_score=0.80,
-                provider="onmeta"
-            )
-        except Exception as e:
-            pass
-        return None
+        params = {
+            "cryptoCurrency": from_asset,
+            "fiatCurrency": to_asset,
+            "network": network,
+            "amount": "100",
+        }
+        
+        data = await self._get_quote(
+            f"ramp:onmeta:offramp:{from_asset}:{to_asset}:{network}",
+            self.ONMETA_OFFRAMP_URL,
+            params,
+            self._onmeta_headers
+        )
+        
+        fee_percent = float(data.get("fee", {}).get("percentage", 2.0))
+        
+        return self.normalize_segment(
+            segment_type=SegmentType.OFF_RAMP,
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_network=network,
+            to_network=None,
+            cost={
+                "fee_percent": fee_percent,
+                "fixed_fee": 0.0,
+                "effective_fx_rate": None
+            },
+            latency={"min_minutes": 15, "max_minutes": 90},
+            reliability_score=0.80,
+            provider="onmeta"
+        )
 
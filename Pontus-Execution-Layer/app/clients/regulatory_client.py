@@ -1,84 +1,109 @@
+import functools
 import json
 import os
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 from app.clients.base_client import BaseClient
 from app.schemas.route_segment import RouteSegment
 
 
+@functools.lru_cache(maxsize=1)
+def _load_constraints_cached() -> Mapping[str, Any]:
+    """Load regulatory constraints from JSON file (once per process)"""
+    constraints_path = os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "..",
+        "data",
+        "regulatory_constraints.json"
+    )
+    
+    # Create default constraints if file doesn't exist
+    default_constraints = {
+        "restricted_pairs": [
+            {"from": "USD", "to": "CNY", "reason": "capital_controls"},
+            {"from": "USD", "to": "RUB", "reason": "sanctions"},
+        ],
+        "max_amounts": {
+            "USD": 10000,
+            "EUR": 10000,
+        },
+        "required_kyc": ["USD", "EUR", "GBP"],
+        "blocked_countries": ["KP", "IR", "SY"],
+        "network_restrictions": {
+            "tornado_cash": {"blocked": True},
+        }
+    }
+    
+    try:
+        if os.path.exists(constraints_path):
+            with open(constraints_path, "r") as f:
+                constraints = json.load(f)
+        else:
+            # Create directory and file with defaults
+            os.makedirs(os.path.dirname(constraints_path), exist_ok=True)
+            with open(constraints_path, "w") as f:
+                json.dump(default_constraints, f, indent=2)
+            constraints = default_constraints
+    except Exception as e:
+        constraints = default_constraints
+    
+    # Shared by every RegulatoryClient, so expose it read-only
+    return MappingProxyType(constraints)
+
+
+@functools.lru_cache(maxsize=1)
+def _restricted_pairs_cached() -> Tuple[Dict[str, int], frozenset]:
+    """
+    Restricted (from, to) pairs packed as ints for O(1) membership checks
+    
+    Each currency code seen gets a small index; a pair is stored as
+    (from_idx << 16) | to_idx, so lookups hash one int instead of a tuple.
+    """
+    restricted = _load_constraints_cached().get("restricted_pairs", [])
+    code_to_idx: Dict[str, int] = {}
+    for p in restricted:
+        code_to_idx.setdefault(p["from"], len(code_to_idx))
+        code_to_idx.setdefault(p["to"], len(code_to_idx))
+    restricted_ints = frozenset(
+        (code_to_idx[p["from"]] << 16) | code_to_idx[p["to"]] for p in restricted
+    )
+    return code_to_idx, restricted_ints
+
+
 class RegulatoryClient(BaseClient):
     """Loads regulatory constraints from local JSON file"""
     
     def __init__(self, client=None):
-        # Regulatory client doesn't need HTTP client
-        # Create a dummy client if None
-        if client is None:
-            import httpx
-            client = httpx.AsyncClient()
+        # Regulatory client doesn't need an HTTP client; None is fine
         super().__init__(client)
-        self.constraints: Dict[str, Any] = {}
         self._load_constraints()
     
     def _load_constraints(self):
-        """Load regulatory constraints from JSON file"""
-        constraints_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "data",
-            "regulatory_constraints.json"
-        )
-        
-        # Create default constraints if file doesn't exist
-        default_constraints = {
-            "restricted_pairs": [
-                {"from": "USD", "to": "CNY", "reason": "capital_controls"},
-                {"from": "USD", "to": "RUB", "reason": "sanctions"},
-            ],
-            "max_amounts": {
-                "USD": 10000,
-                "EUR": 10000,
-            },
-            "required_kyc": ["USD", "EUR", "GBP"],
-            "blocked_countries": ["KP", "IR", "SY"],
-            "network_restrictions": {
-                "tornado_cash": {"blocked": True},
-            }
-        }
-        
-        try:
-            if os.path.exists(constraints_path):
-                with open(constraints_path, "r") as f:
-                    self.constraints = json.load(f)
-            else:
-                # Create directory and file with defaults
-                os.makedirs(os.path.dirname(constraints_path), exist_ok=True)
-                with open(constraints_path, "w") as f:
-                    json.dump(default_constraints, f, indent=2)
-                self.constraints = default_constraints
-        except Exception as e:
-            self.constraints = default_constraints
+        """Load regulatory constraints and precompute lookup structures"""
+        self.constraints: Mapping[str, Any] = _load_constraints_cached()
+        self._code_to_idx, self._restricted_ints = _restricted_pairs_cached()
+        self._max_amounts: Mapping[str, float] = self.constraints.get("max_amounts", {})
     
     async def fetch_segments(self) -> List[RouteSegment]:
         """Regulatory client doesn't fetch segments, just provides constraints"""
         return []
     
-    def get_constraints(self) -> Dict[str, Any]:
+    def get_constraints(self) -> Mapping[str, Any]:
         """Get regulatory constraints"""
         return self.constraints
     
     def is_allowed(self, from_asset: str, to_asset: str, amount: float = None) -> bool:
         """Check if a route is allowed by regulatory constraints"""
-        # Check restricted pairs
-        restricted = self.constraints.get("restricted_pairs", [])
-        for pair in restricted:
-            if pair["from"] == from_asset and pair["to"] == to_asset:
-                return False
+        # Check restricted pairs; unknown codes map to -1, which packs to a
+        # negative key that can never be in the (non-negative) restricted set
+        key = (self._code_to_idx.get(from_asset, -1) << 16) | self._code_to_idx.get(to_asset, -1)
+        if key in self._restricted_ints:
+            return False
         
         # Check max amounts
-        if amount:
-            max_amounts = self.constraints.get("max_amounts", {})
-            if from_asset in max_amounts and amount > max_amounts[from_asset]:
-                return False
+        if amount and (max_amount := self._max_amounts.get(from_asset)) is not None and amount > max_amount:
+            return False
         
         return True
 
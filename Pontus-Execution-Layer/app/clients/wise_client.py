@@ -9,6 +9,9 @@ from datetime import datetime
 
 from app.clients.base_client import BaseClient
 from app.schemas.route_segment import RouteSegment, SegmentType
+from app.infra import singleflight
+from app.infra.http_client import retry_transient
+from app.infra.redis_client import cache_get, cache_set
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -26,26 +29,46 @@ class WiseClient(BaseClient):
         self.api_email = settings.wise_api_email
         self.use_sandbox = False  # Set to True for testing
         
+        # Built once; every Wise call reuses them
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        } if self.api_key else None
+        self._base_url = self.SANDBOX_URL if self.use_sandbox else self.BASE_URL
+        self._cached_profile_id: Optional[str] = None
+        
         if not self.api_key:
             logger.warning("Wise API key not configured")
     
     def _get_headers(self) -> Dict[str, str]:
         """Get authentication headers for Wise API"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        return headers
+        return self._headers
     
     def _get_base_url(self) -> str:
         """Get base URL (sandbox or production)"""
-        return self.SANDBOX_URL if self.use_sandbox else self.BASE_URL
+        return self._base_url
+    
+    @retry_transient
+    async def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST JSON to Wise, retrying transient failures"""
+        response = await self.client.post(
+            url,
+            headers=self._get_headers(),
+            json=payload,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        return response.json()
     
     async def get_profiles(self) -> List[Dict[str, Any]]:
         """Get all profiles associated with the API key"""
         if not self.api_key:
             return []
         
+        return await singleflight.do("wise:profiles", self._get_profiles)
+    
+    async def _get_profiles(self) -> List[Dict[str, Any]]:
+        """Fetch profiles from Wise (uncoalesced)"""
         try:
             url = f"{self._get_base_url()}/v1/profiles"
             response = await self.client.get(url, headers=self._get_headers(), timeout=30.0)
@@ -93,6 +116,7 @@ class WiseClient(BaseClient):
         if not source_amount and not target_amount:
             raise ValueError("Either source_amount or target_amount must be provided")
         
+        # Not coalesced: each quote is consumed by exactly one transfer
         try:
             url = f"{self._get_base_url()}/v2/quotes"
             payload = {
@@ -106,14 +130,7 @@ class WiseClient(BaseClient):
             elif target_amount:
                 payload["targetAmount"] = target_amount
             
-            response = await self.client.post(
-                url,
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._post(url, payload)
         except Exception as e:
             logger.error(f"Error creating Wise quote: {e}")
             return None
@@ -143,14 +160,8 @@ class WiseClient(BaseClient):
                 "customerTransactionId": reference or f"pontus_{datetime.utcnow().isoformat()}"
             }
             
-            response = await self.client.post(
-                url,
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+            # Safe to retry: customerTransactionId makes the transfer idempotent
+            return await self._post(url, payload)
         except Exception as e:
             logger.error(f"Error creating Wise transfer: {e}")
             return None
@@ -167,11 +178,9 @@ class WiseClient(BaseClient):
             return None
         
         try:
+            profile_id = profile_id or await self._get_profile_id()
             if not profile_id:
-                profiles = await self.get_profiles()
-                if not profiles:
-                    raise ValueError("No Wise profiles found")
-                profile_id = profiles[0]["id"]
+                raise ValueError("No Wise profiles found")
             
             url = f"{self._get_base_url()}/v3/profiles/{profile_id}/transfers/{transfer_id}/payments"
             payload = {
@@ -260,11 +269,21 @@ class WiseClient(BaseClient):
             logger.error(f"Error fetching Wise transfer status: {e}")
             return None
     
-    def _get_profile_id(self) -> Optional[str]:
-        """Get default profile ID (cached)"""
-        # This should be cached after first call to get_profiles
-        # For now, return None and let callers provide it
-        return None
+    async def _get_profile_id(self) -> Optional[str]:
+        """Get default profile ID (memoized, backed by Redis)"""
+        if self._cached_profile_id is not None:
+            return self._cached_profile_id
+        
+        profile_id = await cache_get("wise:default_profile")
+        if profile_id is None:
+            profiles = await self.get_profiles()
+            if not profiles:
+                return None
+            profile_id = profiles[0]["id"]
+            await cache_set("wise:default_profile", profile_id, ttl=3600)
+        
+        self._cached_profile_id = profile_id
+        return profile_id
     
     async def execute_bank_transfer(
         self,
@@ -291,11 +310,9 @@ class WiseClient(BaseClient):
             raise ValueError("Wise API key not configured")
         
         # Get profile if not provided
+        profile_id = profile_id or await self._get_profile_id()
         if not profile_id:
-            profiles = await self.get_profiles()
-            if not profiles:
-                raise ValueError("No Wise profiles found")
-            profile_id = profiles[0]["id"]
+            raise ValueError("No Wise profiles found")
         
         # Create quote
         quote = await self.create_quote(
@@ -5,10 +5,23 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql+asyncpg://localhost:5432/routing_db"  # Will use current OS user
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_recycle: int = 300  # Seconds before a pooled connection is replaced
     
     # Redis
     redis_url: str = "redis://localhost:6379/0"
     redis_ttl: int = 2  # TTL in seconds for route data
+    redis_stale_ttl: int = 300  # How long a last-known-good value is kept for fallback
+    redis_pool_size: int = 100  # Max connections in the Redis pool
+    redis_prewarm_connections: int = 10  # Connections opened at startup
+    
+    # Outbound HTTP (shared client for all API clients)
+    http_max_connections: int = 200
+    http_max_keepalive_connections: int = 50
+    http_keepalive_expiry: float = 30.0  # Idle seconds before a pooled connection is dropped (httpx default: 5)
+    http_connect_retries: int = 2  # Transport-level retries of failed connection attempts
+    aggregator_max_concurrency: int = 32  # Adapter fetches in flight across all aggregation runs
     
     # Security
     api_keys: str = ""  # Comma-separated list of valid API keys
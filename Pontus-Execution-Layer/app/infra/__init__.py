@@ -1,5 +1,14 @@
 from .database import get_db, init_db
 from .redis_client import get_redis, init_redis
+from .http_client import get_http_client, init_http_client, close_http_client
 
-__all__ = ["get_db", "init_db", "get_redis", "init_redis"]
+__all__ = [
+    "get_db",
+    "init_db",
+    "get_redis",
+    "init_redis",
+    "get_http_client",
+    "init_http_client",
+    "close_http_client",
+]
 
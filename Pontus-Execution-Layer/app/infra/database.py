@@ -1,9 +1,34 @@
+import asyncio
+from pathlib import Path
+import orjson
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
 from app.models.route_segment import Base
 
+# asyncpg-specific tuning: keep prepared statements cached per connection and
+# disable PG JIT, whose warmup only hurts short OLTP queries
+_connect_args = {
+    "server_settings": {"jit": "off"},
+    "statement_cache_size": 1024,
+} if "asyncpg" in settings.database_url else {}
+
+
+def _json_serializer(value) -> str:
+    """orjson for JSON columns (snapshots, segment cost/latency) instead of stdlib json"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
 engine = create_async_engine(
     settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=False,
+    connect_args=_connect_args,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
     echo=False,
     future=True
 )
@@ -26,10 +51,39 @@ async def get_db():
 async def init_db():
     try:
         async with engine.begin() as conn:
+            # Every worker runs this on startup; serialize schema setup and migrations
+            # (which delete duplicate rows) across them. Released when the transaction ends.
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _SCHEMA_LOCK_KEY})
             await conn.run_sync(Base.metadata.create_all)
+            # create_all never alters existing tables; migrations bring them up to date
+            await conn.run_sync(_run_migrations)
+        await warm_db_pool(settings.db_pool_size)
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"⚠️  Database initialization failed: {e}")
         print("   App will continue but database features may not work")
         print("   Make sure PostgreSQL is running and DATABASE_URL is correct")
 
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Arbitrary application-wide key for pg_advisory_xact_lock around init_db
+_SCHEMA_LOCK_KEY = 0x506F6E747573
+
+
+def _run_migrations(connection):
+    """Apply pending alembic migrations on the given sync connection"""
+    config = Config(str(_PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(_PROJECT_ROOT / "alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+async def warm_db_pool(size: int):
+    """Open pool connections up front so first requests don't pay connect + auth"""
+    async def _checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Concurrent checkouts force the pool to open `size` distinct connections
+    await asyncio.gather(*(_checkout() for _ in range(size)))
@@ -0,0 +1,66 @@
+import httpx
+from app.config import settings
+from typing import Optional
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client used by all API clients"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = init_http_client()
+    return _http_client
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client (called at FastAPI startup)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                # HTTP/2 multiplexes concurrent calls to one provider over a single connection
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    max_connections=settings.http_max_connections,
+                    # Outlive the gaps between a route's segment calls to the same provider
+                    keepalive_expiry=settings.http_keepalive_expiry,
+                ),
+                # Only connect failures are retried here (nothing was sent yet), so
+                # non-idempotent calls like transfers are safe; see retry_transient
+                retries=settings.http_connect_retries,
+            ),
+            # No pool timeout: requests queue for a free connection during fan-out
+            timeout=httpx.Timeout(10.0, connect=3.0, pool=None),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection-level failures and upstream 5xx are worth retrying; 4xx are not"""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+
+
+# Bounded retry for flaky upstreams: 3 attempts, ~100ms then ~400ms backoff
+retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.1, exp_base=4, max=1.0, jitter=0.05),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
@@ -1,7 +1,7 @@
 import redis.asyncio as redis
 from app.config import settings
-import json
-from typing import Optional, Any
+import orjson
+from typing import Optional, Any, Awaitable, Callable, Dict
 
 _redis_client: Optional[redis.Redis] = None
 
@@ -14,11 +14,22 @@ async def get_redis() -> redis.Redis:
 
 
 async def init_redis() -> redis.Redis:
+    global _redis_client
     try:
-        client = redis.from_url(settings.redis_url, decode_responses=True)
+        # Raw bytes in and out; orjson works on bytes directly
+        client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=False,
+            max_connections=settings.redis_pool_size,
+            socket_keepalive=True,
+            health_check_interval=30,
+            retry_on_timeout=True,
+        )
         # Test connection
         await client.ping()
+        await _prewarm_pool(client, settings.redis_prewarm_connections)
         print("✅ Redis connected successfully")
+        _redis_client = client
         return client
     except Exception as e:
         print(f"⚠️  Redis connection failed: {e}")
@@ -28,6 +39,18 @@ async def init_redis() -> redis.Redis:
         return None
 
 
+async def _prewarm_pool(client: redis.Redis, count: int):
+    """Open connections up front so first requests don't pay the TCP handshake"""
+    pool = client.connection_pool
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(await pool.get_connection("PING"))
+    finally:
+        for connection in connections:
+            await pool.release(connection)
+
+
 async def close_redis():
     global _redis_client
     if _redis_client:
@@ -35,13 +58,37 @@ async def close_redis():
         _redis_client = None
 
 
+def _encode(value: Any):
+    """Serialize a cache value; pydantic models use their own (Rust) JSON encoder"""
+    if hasattr(value, "model_dump_json"):
+        return value.model_dump_json()
+    if isinstance(value, list) and value and hasattr(value[0], "model_dump_json"):
+        return "[" + ",".join(v.model_dump_json() for v in value) + "]"
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
 async def cache_set(key: str, value: Any, ttl: int = None):
     try:
         client = await get_redis()
         if client is None:
             return  # Skip caching if Redis not available
         ttl = ttl or settings.redis_ttl
-        await client.setex(key, ttl, json.dumps(value, default=str))
+        await client.setex(key, ttl, _encode(value))
+    except Exception:
+        pass  # Fail silently if caching fails
+
+
+async def cache_set_many(items: Dict[str, Any], ttl: int = None):
+    """Set several keys in one pipelined round-trip"""
+    try:
+        client = await get_redis()
+        if client is None:
+            return  # Skip caching if Redis not available
+        ttl = ttl or settings.redis_ttl
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, _encode(value))
+            await pipe.execute()
     except Exception:
         pass  # Fail silently if caching fails
 
@@ -53,8 +100,33 @@ async def cache_get(key: str) -> Optional[Any]:
             return None
         value = await client.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
     except Exception:
         pass
     return None
 
+
+
+async def cached_fetch(key: str, ttl: int, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached value for key, or await fetch_fn() and cache its result.
+    
+    A copy is also kept under "<key>:stale" for settings.redis_stale_ttl; if
+    fetch_fn raises, that last-known-good value is returned instead.
+    """
+    cached = await cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        value = await fetch_fn()
+    except Exception:
+        stale = await cache_get(f"{key}:stale")
+        if stale is not None:
+            return stale
+        raise
+    
+    if value is not None:
+        await cache_set(key, value, ttl=ttl)
+        await cache_set(f"{key}:stale", value, ttl=settings.redis_stale_ttl)
+    return value
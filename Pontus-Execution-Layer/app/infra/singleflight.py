@@ -0,0 +1,27 @@
+"""
+In-flight request coalescing
+
+Concurrent calls with the same key share a single underlying coroutine, so a
+burst of identical upstream requests only hits the upstream once.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def do(key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Await coro_factory() for key, joining an identical call already in flight"""
+    fut = _inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(coro_factory())
+        _inflight[key] = fut
+
+        def _forget(done: asyncio.Future):
+            if _inflight.get(key) is done:
+                del _inflight[key]
+
+        fut.add_done_callback(_forget)
+
+    # Shield so one cancelled caller doesn't cancel the call for everyone else
+    return await asyncio.shield(fut)
@@ -1,9 +1,11 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 import logging
+import os
+import sys
 
 from app.api.routes_data import router, set_aggregator
 from app.api.routes_optimization import (
@@ -24,16 +26,14 @@ from app.api.routes_fx_intelligence import (
     set_services as set_fx_services
 )
 from app.services.aggregator_service import AggregatorService
-from app.services.routing_service import RoutingService
-from app.services.execution.execution_service import ExecutionService
 from app.infra.database import init_db
 from app.infra.redis_client import init_redis
+from app.infra.http_client import init_http_client, close_http_client
 from app.tasks.background_tasks import start_background_tasks, stop_background_tasks
 from app.infra.logging_config import setup_logging
-from app.middleware.rate_limit import limiter, rate_limit_handler
-from app.middleware.auth import verify_api_key
+from app.middleware.security import SecurityMiddleware
+from app.middleware.auth import require_api_key
 from app.config import settings
-from slowapi.errors import RateLimitExceeded
 
 # Setup logging first
 logger = setup_logging()
@@ -43,12 +43,18 @@ logger.info("Starting Pontus Routing API...")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
+    # Deferred so importing the app (e.g. per worker) doesn't build the solver stack
+    from app.services.routing_service import RoutingService
+    from app.services.execution.execution_service import ExecutionService
+    from app.services.argmax_decision import warm_score_kernel
+    
     # Startup
-    logger.info("Initializing database...")
-    await init_db()
+    logger.info("Initializing database and Redis...")
+    # Both open and warm their connection pools; run them side by side
+    await asyncio.gather(init_db(), init_redis())
     
-    logger.info("Initializing Redis...")
-    await init_redis()
+    logger.info("Initializing shared HTTP client...")
+    app.state.http_client = init_http_client()
     
     logger.info("Initializing aggregator service...")
     aggregator = AggregatorService()
@@ -59,11 +65,14 @@ async def lifespan(app: FastAPI):
     # Auto-detect CPLEX: use CPLEX if available, OR-Tools as graceful fallback
     routing_service = RoutingService(use_cplex=None)  # None = auto-detect CPLEX, fallback to OR-Tools
     set_routing_service(routing_service)
+    # JIT-compile the route selection kernel now rather than on the first request
+    warm_score_kernel()
     
     logger.info("Initializing execution service...")
     execution_service = ExecutionService(
         routing_service=routing_service,
-        aggregator_service=aggregator
+        aggregator_service=aggregator,
+        http_client=app.state.http_client
     )
     set_execution_service(execution_service)
     
@@ -84,8 +93,8 @@ async def lifespan(app: FastAPI):
     logger.info("Stopping background tasks...")
     await stop_background_tasks()
     
-    logger.info("Closing aggregator...")
-    await aggregator.close()
+    logger.info("Closing shared HTTP client...")
+    await close_http_client()
     
     logger.info("Application shutdown complete")
 
@@ -97,49 +106,44 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Configure CORS
-cors_origins = [origin.strip() for origin in settings.cors_origins.split(",")] if settings.cors_origins != "*" else ["*"]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
-)
-logger.info(f"CORS configured for origins: {cors_origins}")
-
-# Setup rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
-logger.info(f"Rate limiting configured: {settings.rate_limit_per_minute} req/min, {settings.rate_limit_per_hour} req/hour")
+# Rate limiting as a pure ASGI pass (registered before CORS so CORS wraps it
+# and preflight/429 responses still carry CORS headers)
+app.add_middleware(SecurityMiddleware)
+logger.info("Rate limiting configured: %s req/min token bucket per client", settings.rate_limit_per_minute)
 
-# API Key Authentication Middleware (if enabled)
+# API key authentication (if enabled) as a router dependency; root and docs stay public
 if settings.require_api_key:
-    @app.middleware("http")
-    async def auth_middleware(request: Request, call_next):
-        # Skip auth for health check, docs, and root
-        if request.url.path in ["/health", "/docs", "/openapi.json", "/", "/redoc"]:
-            return await call_next(request)
-        
-        is_valid = await verify_api_key(request)
-        if not is_valid:
-            return JSONResponse(
-                status_code=401,
-                content={"error": "Unauthorized", "detail": "Invalid or missing API key"}
-            )
-        
-        return await call_next(request)
+    protected = [Depends(require_api_key)]
     logger.info("API key authentication enabled")
 else:
+    protected = []
     logger.info("API key authentication disabled (set REQUIRE_API_KEY=true to enable)")
 
+# Configure CORS
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE")
+CORS_ALLOW_HEADERS = ("Content-Type", "X-API-Key", "Authorization")
+CORS_EXPOSE_HEADERS = ("X-RateLimit-Limit", "X-RateLimit-Remaining")
+
+cors_origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
+# Browsers reject a wildcard origin on credentialed requests; only allow credentials
+# when the origins are listed explicitly
+cors_allow_credentials = "*" not in cors_origins
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=cors_origins,
+    allow_credentials=cors_allow_credentials,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+    expose_headers=CORS_EXPOSE_HEADERS,
+)
+logger.info("CORS configured for origins: %s", cors_origins)
+
 # Include routers
-app.include_router(router)  # Data layer endpoints
-app.include_router(optimization_router)  # Routing optimization endpoints
-app.include_router(execution_router)  # Execution layer endpoints
-app.include_router(treasury_router)  # Treasury management endpoints
-app.include_router(fx_intelligence_router)  # FX intelligence endpoints
+app.include_router(router, dependencies=protected)  # Data layer endpoints
+app.include_router(optimization_router, dependencies=protected)  # Routing optimization endpoints
+app.include_router(execution_router, dependencies=protected)  # Execution layer endpoints
+app.include_router(treasury_router, dependencies=protected)  # Treasury management endpoints
+app.include_router(fx_intelligence_router, dependencies=protected)  # FX intelligence endpoints
 
 
 @app.get("/")
@@ -158,10 +162,17 @@ async def root():
 
 
 if __name__ == "__main__":
+    dev_mode = os.getenv("ENV", "").lower() == "dev"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # uvloop speeds up the gather-heavy client fan-out; not available on Windows
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        # Executions, rate-limit buckets and background loops are per process, so
+        # scale out with WEB_CONCURRENCY only behind sticky routing
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=dev_mode
     )
 
@@ -1,13 +1,18 @@
 """
 Middleware package
 """
-from app.middleware.auth import verify_api_key, api_key_auth_middleware
-from app.middleware.rate_limit import limiter, rate_limit_handler
+from app.middleware.auth import verify_api_key, check_api_key, get_request_api_key, require_api_key, api_key_auth_middleware
+from app.middleware.rate_limit import TokenBucketLimiter, limiter
+from app.middleware.security import SecurityMiddleware
 
 __all__ = [
     "verify_api_key",
+    "check_api_key",
+    "get_request_api_key",
+    "require_api_key",
     "api_key_auth_middleware",
+    "TokenBucketLimiter",
     "limiter",
-    "rate_limit_handler"
+    "SecurityMiddleware"
 ]
 
@@ -1,14 +1,65 @@
 """
 API Key Authentication Middleware
 """
-from fastapi import Request, HTTPException, status
+from fastapi import Request, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Tuple
+from functools import lru_cache
 import logging
+import time
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+# Declares the X-API-Key scheme in OpenAPI so /docs offers "Authorize"
+_api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+# Paths api_key_auth_middleware never checks
+_SKIP_AUTH_PATHS = frozenset({"/health", "/docs", "/openapi.json", "/", "/redoc"})
+
+# Recent auth decisions: api_key -> (is_valid, checked_at); oldest entry evicted first
+_AUTH_CACHE_MAXSIZE = 1024
+_AUTH_CACHE_TTL = 60.0
+_auth_cache: Dict[str, Tuple[bool, float]] = {}
+
+
+@lru_cache(maxsize=1)
+def _valid_keys() -> FrozenSet[str]:
+    """Configured API keys, parsed from the comma-separated setting on first use"""
+    return frozenset(k.strip() for k in settings.api_keys.split(",") if k.strip())
+
+
+def check_api_key(api_key: str) -> bool:
+    """Check a non-empty API key against the configured keys (cached for 60s)"""
+    now = time.monotonic()
+    cached = _auth_cache.get(api_key)
+    if cached is not None and now - cached[1] < _AUTH_CACHE_TTL:
+        return cached[0]
+    
+    is_valid = api_key in _valid_keys()
+    if is_valid:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Valid API key used: %s...", api_key[:8])
+    else:
+        logger.warning("Invalid API key attempted: %s...", api_key[:8])
+    
+    _auth_cache.pop(api_key, None)
+    if len(_auth_cache) >= _AUTH_CACHE_MAXSIZE:
+        del _auth_cache[next(iter(_auth_cache))]
+    _auth_cache[api_key] = (is_valid, now)
+    return is_valid
+
+
+def get_request_api_key(request: Request) -> Optional[str]:
+    """
+    API key for this request: the value SecurityMiddleware already pulled from
+    the X-API-Key header / api_key query parameter, else read it here.
+    """
+    state = request.scope.get("state")
+    if state is not None and "api_key" in state:
+        return state["api_key"]
+    return request.headers.get("X-API-Key") or request.query_params.get("api_key")
 
 
 async def verify_api_key(request: Request, api_key: Optional[str] = None) -> bool:
@@ -22,40 +73,51 @@ async def verify_api_key(request: Request, api_key: Optional[str] = None) -> boo
     Returns:
         True if API key is valid, False otherwise
     """
-    from app.config import settings
-    
     # If API key not required, allow all requests
     if not settings.require_api_key:
         return True
     
     # Get API key from header or query parameter
     if not api_key:
-        api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
+        api_key = get_request_api_key(request)
     
     if not api_key:
-        logger.warning(f"API key missing from request: {request.url}")
+        logger.warning("API key missing from request: %s", request.url)
         return False
     
     # Check against configured API keys
-    valid_keys = [k.strip() for k in settings.api_keys.split(",") if k.strip()]
-    
-    if api_key in valid_keys:
-        logger.debug(f"Valid API key used: {api_key[:8]}...")
-        return True
+    return check_api_key(api_key)
+
+
+async def require_api_key(
+    request: Request,
+    _documented_key: Optional[str] = Security(_api_key_scheme)
+):
+    """
+    Router dependency that rejects requests without a valid API key.
     
-    logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
-    return False
+    Attach with include_router(..., dependencies=[Depends(require_api_key)]);
+    routes outside those routers (root, docs) stay public. _documented_key only
+    exposes the scheme in OpenAPI; the key itself comes from get_request_api_key.
+    """
+    api_key = get_request_api_key(request)
+    if not api_key:
+        logger.warning("API key missing from request")
+    if not (api_key and check_api_key(api_key)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key"
+        )
 
 
 async def api_key_auth_middleware(request: Request, call_next):
     """
     Middleware to check API key authentication.
     """
-    from app.config import settings
     from fastapi.responses import JSONResponse
     
     # Skip auth for health check and docs
-    if request.url.path in ["/health", "/docs", "/openapi.json", "/", "/redoc"]:
+    if request.url.path in _SKIP_AUTH_PATHS:
         return await call_next(request)
     
     # Check API key
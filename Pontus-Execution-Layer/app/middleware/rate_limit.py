@@ -1,46 +1,61 @@
 """
-Rate Limiting Middleware
+Rate Limiting
+
+In-process token bucket per client: each key holds (tokens, last_refill) and
+refills continuously at rate_limit_per_minute / 60 tokens per second.
 """
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request
-from fastapi.responses import JSONResponse
+from typing import Dict, Tuple
 import logging
+import threading
+import time
 
-logger = logging.getLogger(__name__)
+from app.config import settings
 
+logger = logging.getLogger(__name__)
 
-def get_rate_limit_key(request: Request) -> str:
-    """
-    Get rate limit key - prefer API key if available, otherwise use IP.
-    """
-    # Try to get API key from header or query
-    api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
-    
-    if api_key:
-        # Rate limit by API key (allows higher limits for authenticated users)
-        return f"api_key:{api_key}"
-    
-    # Fall back to IP address
-    return get_remote_address(request)
-
-
-# Initialize rate limiter with custom key function
-limiter = Limiter(key_func=get_rate_limit_key)
-
-
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    """
-    Custom handler for rate limit exceeded.
-    """
-    logger.warning(f"Rate limit exceeded for {get_remote_address(request)}")
-    return JSONResponse(
-        status_code=429,
-        content={
-            "error": "Rate limit exceeded",
-            "message": f"Too many requests. Limit: {exc.detail}",
-            "retry_after": 60
+# Idle buckets are pruned once the table grows past this many keys
+_MAX_BUCKETS = 10000
+
+
+class TokenBucketLimiter:
+    """Token bucket keyed by client (API key or IP)"""
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = float(capacity)
+        self.refill_rate = refill_rate  # tokens per second
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        # Uncontended under a single event loop; keeps allow() safe from threadpool callers
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Take one token for key; False when the bucket is empty"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.refill_rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            if key not in self._buckets and len(self._buckets) >= _MAX_BUCKETS:
+                self._prune(now)
+            self._buckets[key] = (tokens, now)
+        return allowed
+
+    def remaining(self, key: str) -> int:
+        """Whole tokens left for key as of its last request"""
+        bucket = self._buckets.get(key)
+        return int(bucket[0]) if bucket else int(self.capacity)
+
+    def _prune(self, now: float):
+        """Drop buckets idle long enough to have refilled completely"""
+        full_after = self.capacity / self.refill_rate
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket[1] < full_after
         }
-    )
 
+
+limiter = TokenBucketLimiter(
+    capacity=settings.rate_limit_per_minute,
+    refill_rate=settings.rate_limit_per_minute / 60.0
+)
@@ -0,0 +1,97 @@
+"""
+Security Middleware
+
+Pure-ASGI rate limiting: the path, API key and client key are read straight
+from the ASGI scope once per request, with no Starlette Request/Response
+objects in between. API key auth is a router dependency (auth.require_api_key).
+"""
+from typing import Optional
+from urllib.parse import parse_qs
+import json
+import logging
+
+from app.config import settings
+from app.middleware.rate_limit import limiter
+
+logger = logging.getLogger(__name__)
+
+# Paths that skip rate limiting
+_PUBLIC_PATHS = frozenset({"/health", "/docs", "/openapi.json", "/", "/redoc"})
+
+_RATE_LIMITED_BODY = json.dumps({
+    "error": "Rate limit exceeded",
+    "message": f"Too many requests. Limit: {settings.rate_limit_per_minute} per 1 minute",
+    "retry_after": 60
+}).encode()
+
+_LIMIT_HEADER = (b"x-ratelimit-limit", str(settings.rate_limit_per_minute).encode())
+
+
+def _get_api_key(scope) -> Optional[str]:
+    """API key from the X-API-Key header, falling back to the api_key query parameter"""
+    for name, value in scope["headers"]:
+        if name == b"x-api-key":
+            return value.decode("latin-1")
+
+    query_string = scope.get("query_string", b"")
+    if b"api_key=" in query_string:
+        values = parse_qs(query_string.decode("latin-1")).get("api_key")
+        if values:
+            return values[0]
+    return None
+
+
+async def _send_json(send, status_code: int, body: bytes, extra_headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *extra_headers
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class SecurityMiddleware:
+    """Token-bucket rate limiting per API key (or client IP)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in _PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        api_key = _get_api_key(scope)
+        # Shared with the auth dependency via request.state so it is parsed once
+        scope.setdefault("state", {})["api_key"] = api_key
+        client = scope.get("client")
+        client_host = client[0] if client else "127.0.0.1"
+        if api_key:
+            # Rate limit by API key (allows higher limits for authenticated users)
+            client_key = f"api_key:{api_key}"
+        else:
+            client_key = client_host
+
+        if not limiter.allow(client_key):
+            # Never log the full key; the bucket ID contains it
+            if api_key:
+                logger.warning("Rate limit exceeded for %s (api_key %s...)", client_host, api_key[:8])
+            else:
+                logger.warning("Rate limit exceeded for %s", client_host)
+            await _send_json(send, 429, _RATE_LIMITED_BODY, ((b"retry-after", b"60"),))
+            return
+
+        async def send_with_limit_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    _LIMIT_HEADER,
+                    (b"x-ratelimit-remaining", str(limiter.remaining(client_key)).encode())
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_limit_headers)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, JSON, DateTime, Text, Index
+from sqlalchemy import Column, String, Float, Integer, JSON, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -11,7 +11,7 @@ class RouteSegmentModel(Base):
     __tablename__ = "route_segments"
     
     id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
-    segment_type = Column(String(50), nullable=False, index=True)
+    segment_type = Column(String(50), nullable=False)  # Leading column of the composite indexes
     from_asset = Column(String(10), nullable=False, index=True)
     to_asset = Column(String(10), nullable=False, index=True)
     from_network = Column(String(50), nullable=True, index=True)
@@ -20,13 +20,18 @@ class RouteSegmentModel(Base):
     latency = Column(JSON, nullable=False)
     reliability_score = Column(Float, nullable=False, default=1.0)
     constraints = Column(JSON, nullable=False, default={})
-    provider = Column(String(100), nullable=True)
+    # Part of uq_segment_identity; NOT NULL so ON CONFLICT matches provider-less rows
+    provider = Column(String(100), nullable=False, default="", server_default="")
     timestamp = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     __table_args__ = (
         Index('idx_segment_lookup', 'segment_type', 'from_asset', 'to_asset'),
+        # Serves get_segments_from_db: filter by type, ORDER BY timestamp DESC
+        Index('idx_segment_type_ts', 'segment_type', 'timestamp'),
+        # Upsert target for persist_segments (INSERT ... ON CONFLICT)
+        UniqueConstraint('provider', 'segment_type', 'from_asset', 'to_asset', name='uq_segment_identity'),
     )
 
 
@@ -1,13 +1,13 @@
 """
 Execution Layer Schemas
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class ExecutionStatus(str, Enum):
+class ExecutionStatus(StrEnum):
     """Execution status enum"""
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -18,7 +18,7 @@ class ExecutionStatus(str, Enum):
     REROUTING = "rerouting"
 
 
-class SegmentExecutionStatus(str, Enum):
+class SegmentExecutionStatus(StrEnum):
     """Segment execution status"""
     PENDING = "pending"
     EXECUTING = "executing"
@@ -30,6 +30,8 @@ class SegmentExecutionStatus(str, Enum):
 
 class SegmentExecutionResult(BaseModel):
     """Result of executing a single segment"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     segment_index: int
     segment_type: str
     from_asset: str
@@ -51,6 +53,8 @@ class SegmentExecutionResult(BaseModel):
 
 class RouteExecutionRequest(BaseModel):
     """Request to execute a route"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     from_asset: str
     to_asset: str
     amount: float = Field(gt=0, description="Amount to transfer in from_asset")
@@ -68,6 +72,8 @@ class RouteExecutionRequest(BaseModel):
 
 class RouteExecutionResponse(BaseModel):
     """Response from route execution"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     execution_id: str
     status: ExecutionStatus
     route: List[Dict[str, Any]]
@@ -86,6 +92,8 @@ class RouteExecutionResponse(BaseModel):
 
 class ExecutionStatusResponse(BaseModel):
     """Status of an execution"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     execution_id: str
     status: ExecutionStatus
     current_segment: Optional[int] = None
@@ -102,6 +110,8 @@ class ExecutionStatusResponse(BaseModel):
 
 class RerouteRequest(BaseModel):
     """Request to reroute an execution"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     execution_id: str
     from_current_position: bool = True  # Reroute from current position or restart
     new_route: Optional[List[Dict[str, Any]]] = None  # Optional: provide new route directly
@@ -109,6 +119,8 @@ class RerouteRequest(BaseModel):
 
 class CancelExecutionRequest(BaseModel):
     """Request to cancel an execution"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     execution_id: str
     cancel_pending_segments: bool = True  # Cancel pending segments
     rollback_completed: bool = False  # Attempt to rollback completed segments
@@ -116,6 +128,8 @@ class CancelExecutionRequest(BaseModel):
 
 class ModifyTransactionRequest(BaseModel):
     """Request to modify a transaction"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     execution_id: str
     segment_index: int
     new_amount: Optional[float] = None
@@ -1,9 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Union
 from datetime import datetime
 
 
 class FXQuote(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     from_currency: str
     to_currency: str
     rate: float
@@ -12,6 +14,8 @@ class FXQuote(BaseModel):
 
 
 class CryptoQuote(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     from_asset: str
     to_asset: str
     from_network: Optional[str]
@@ -22,6 +26,8 @@ class CryptoQuote(BaseModel):
 
 
 class GasQuote(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     network: str
     gas_price_gwei: float
     provider: str
@@ -29,6 +35,8 @@ class GasQuote(BaseModel):
 
 
 class QuoteResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     quotes: List[Union[FXQuote, CryptoQuote, GasQuote]]
     count: int
 
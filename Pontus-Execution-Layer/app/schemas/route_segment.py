@@ -1,10 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
-from enum import Enum
+from functools import cached_property
+from enum import StrEnum
 from datetime import datetime
 
 
-class SegmentType(str, Enum):
+class SegmentType(StrEnum):
     FX = "fx"
     CRYPTO = "crypto"
     GAS = "gas"
@@ -16,6 +17,9 @@ class SegmentType(str, Enum):
 
 
 class RouteSegment(BaseModel):
+    # Segments are read-only once built; frozen skips assignment handling
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
+    
     id: Optional[str] = None
     segment_type: SegmentType
     from_asset: str
@@ -40,8 +44,23 @@ class RouteSegment(BaseModel):
     provider: Optional[str] = None
     timestamp: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    # Flat views of the cost/latency dicts for the routing solvers; read once
+    # per segment and cached (safe because the model is frozen)
+    @cached_property
+    def fee_percent(self) -> float:
+        return self.cost.get('fee_percent', 0.0)
+    
+    @cached_property
+    def fixed_fee(self) -> float:
+        return self.cost.get('fixed_fee', 0.0)
+    
+    @cached_property
+    def min_minutes(self) -> int:
+        return self.latency.get('min_minutes', 0)
+    
+    @cached_property
+    def max_minutes(self) -> int:
+        return self.latency.get('max_minutes', 0)
 
 
 class RouteSegmentCreate(RouteSegment):
@@ -1,4 +1,3 @@
-import httpx
 import asyncio
 from typing import List, Dict, Any
 from datetime import datetime
@@ -8,11 +7,15 @@ from app.clients import (
     FXClient, CryptoClient, GasClient, BridgeClient,
     RampClient, BankRailClient, LiquidityClient, RegulatoryClient
 )
-from app.schemas.route_segment import RouteSegment
-from app.infra.redis_client import cache_set, cache_get
+from app.schemas.route_segment import RouteSegment, SegmentType
+from app.infra.redis_client import cache_set_many, cache_get
+from app.infra.http_client import get_http_client
 from app.infra.database import AsyncSessionLocal
+from app.config import settings
 from app.models.route_segment import RouteSegmentModel, SnapshotModel
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
 import json
 
 
@@ -20,7 +23,7 @@ class AggregatorService:
     """Aggregates data from all adapters, normalizes, caches, and persists"""
     
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = get_http_client()
         self.clients = {
             "fx": FXClient(self.http_client),
             "crypto": CryptoClient(self.http_client),
@@ -31,17 +34,25 @@ class AggregatorService:
             "liquidity": LiquidityClient(self.http_client),
             "regulatory": RegulatoryClient(self.http_client),
         }
+        # Caps concurrent adapter fetches when the background loop and API requests overlap
+        self._fetch_semaphore = asyncio.Semaphore(settings.aggregator_max_concurrency)
+        # Bumped whenever fresh segments are cached; lets route lookups key memoized results on it
+        self.segments_version = 0
+    
+    async def _guarded_fetch(self, name: str) -> List[RouteSegment]:
+        async with self._fetch_semaphore:
+            return await self.clients[name].fetch_segments()
     
     async def fetch_all_segments(self) -> List[RouteSegment]:
         """Fetch segments from all adapters in parallel"""
         tasks = [
-            self.clients["fx"].fetch_segments(),
-            self.clients["crypto"].fetch_segments(),
-            self.clients["gas"].fetch_segments(),
-            self.clients["bridge"].fetch_segments(),
-            self.clients["ramp"].fetch_segments(),
-            self.clients["bank_rail"].fetch_segments(),
-            self.clients["liquidity"].fetch_segments(),
+            self._guarded_fetch("fx"),
+            self._guarded_fetch("crypto"),
+            self._guarded_fetch("gas"),
+            self._guarded_fetch("bridge"),
+            self._guarded_fetch("ramp"),
+            self._guarded_fetch("bank_rail"),
+            self._guarded_fetch("liquidity"),
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -68,96 +79,100 @@ class AggregatorService:
     async def cache_segments(self, segments: List[RouteSegment]):
         """Cache segments in Redis"""
         cache_key = "routes:segments:latest"
-        segments_dict = [seg.dict() for seg in segments]
-        await cache_set(cache_key, segments_dict, ttl=2)
+        # JSON-ready primitives straight from pydantic-core; the Redis cache encodes with orjson
+        segments_dict = [seg.model_dump(mode="json") for seg in segments]
+        entries: Dict[str, Any] = {cache_key: segments_dict}
         
         # Also cache by segment type
-        by_type: Dict[str, List[Dict]] = {}
         for seg in segments_dict:
-            seg_type = seg.get("segment_type")
-            if seg_type not in by_type:
-                by_type[seg_type] = []
-            by_type[seg_type].append(seg)
+            entries.setdefault(f"routes:segments:{seg.get('segment_type')}", []).append(seg)
         
-        for seg_type, segs in by_type.items():
-            await cache_set(f"routes:segments:{seg_type}", segs, ttl=2)
+        # Latest + every per-type key in a single pipelined round-trip
+        await cache_set_many(entries, ttl=2)
+        self.segments_version += 1
     
     async def persist_segments(self, segments: List[RouteSegment]):
         """Persist segments to Postgres"""
-        async with AsyncSessionLocal() as session:
-            try:
-                # Convert to models and insert/update
-                for seg in segments:
-                    # Check if segment exists (by provider, type, from_asset, to_asset)
-                    stmt = select(RouteSegmentModel).where(
-                        RouteSegmentModel.provider == seg.provider,
-                        RouteSegmentModel.segment_type == seg.segment_type.value,
-                        RouteSegmentModel.from_asset == seg.from_asset,
-                        RouteSegmentModel.to_asset == seg.to_asset,
-                    )
-                    result = await session.execute(stmt)
-                    existing = result.scalar_one_or_none()
-                    
-                    if existing:
-                        # Update existing
-                        existing.cost = seg.cost
-                        existing.latency = seg.latency
-                        existing.reliability_score = seg.reliability_score
-                        existing.constraints = seg.constraints
-                        existing.timestamp = seg.timestamp
-                    else:
-                        # Create new
-                        new_segment = RouteSegmentModel(
-                            id=str(uuid.uuid4()),
-                            segment_type=seg.segment_type.value,
-                            from_asset=seg.from_asset,
-                            to_asset=seg.to_asset,
-                            from_network=seg.from_network,
-                            to_network=seg.to_network,
-                            cost=seg.cost,
-                            latency=seg.latency,
-                            reliability_score=seg.reliability_score,
-                            constraints=seg.constraints,
-                            provider=seg.provider,
-                            timestamp=seg.timestamp,
-                        )
-                        session.add(new_segment)
-                
-                await session.commit()
-            except Exception as e:
-                await session.rollback()
-                raise
+        async with AsyncSessionLocal() as session, session.begin():
+            await self._persist_segments_in(session, segments)
     
     async def persist_snapshot(self, segments: List[RouteSegment]):
         """Persist a snapshot of all segments"""
-        async with AsyncSessionLocal() as session:
+        async with AsyncSessionLocal() as session, session.begin():
+            await self._persist_snapshot_in(session, segments)
+    
+    async def persist_all(self, segments: List[RouteSegment]):
+        """Upsert segments and record a snapshot in one session and transaction"""
+        upsert_error = None
+        async with AsyncSessionLocal() as session, session.begin():
+            # Savepoint keeps the snapshot independent of the upsert, as it was
+            # when each had its own transaction
             try:
-                # Serialize segments to JSON-compatible format
-                segments_data = []
-                for seg in segments:
-                    seg_dict = seg.dict()
-                    # Convert any datetime objects to ISO format strings
-                    for key, value in seg_dict.items():
-                        if isinstance(value, datetime):
-                            seg_dict[key] = value.isoformat()
-                    segments_data.append(seg_dict)
-                
-                snapshot_data = {
-                    "segments": segments_data,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "count": len(segments)
-                }
-                
-                snapshot = SnapshotModel(
-                    id=str(uuid.uuid4()),
-                    snapshot_data=snapshot_data,
-                    segment_count=len(segments)
-                )
-                session.add(snapshot)
-                await session.commit()
+                async with session.begin_nested():
+                    await self._persist_segments_in(session, segments)
             except Exception as e:
-                await session.rollback()
-                raise
+                upsert_error = e
+            await self._persist_snapshot_in(session, segments)
+        if upsert_error is not None:
+            raise upsert_error
+    
+    async def _persist_segments_in(self, session: AsyncSession, segments: List[RouteSegment]):
+        """Bulk upsert segments within the caller's transaction"""
+        # One row per (provider, type, from_asset, to_asset); ON CONFLICT
+        # rejects a batch that touches the same row twice, so last one wins
+        rows = {}
+        for seg in segments:
+            # provider is NOT NULL in the table ("" = none) so the row can conflict
+            provider = seg.provider or ""
+            rows[(provider, seg.segment_type, seg.from_asset, seg.to_asset)] = {
+                "id": str(uuid.uuid4()),
+                "segment_type": seg.segment_type,
+                "from_asset": seg.from_asset,
+                "to_asset": seg.to_asset,
+                "from_network": seg.from_network,
+                "to_network": seg.to_network,
+                "cost": seg.cost,
+                "latency": seg.latency,
+                "reliability_score": seg.reliability_score,
+                "constraints": seg.constraints,
+                "provider": provider,
+                "timestamp": seg.timestamp,
+            }
+        
+        if not rows:
+            return
+        
+        # Single bulk upsert instead of a SELECT + INSERT/UPDATE per segment
+        stmt = insert(RouteSegmentModel).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_segment_identity",
+            set_={
+                "cost": stmt.excluded.cost,
+                "latency": stmt.excluded.latency,
+                "reliability_score": stmt.excluded.reliability_score,
+                "constraints": stmt.excluded.constraints,
+                "timestamp": stmt.excluded.timestamp,
+                "updated_at": func.now(),
+            }
+        )
+        await session.execute(stmt)
+    
+    async def _persist_snapshot_in(self, session: AsyncSession, segments: List[RouteSegment]):
+        """Add a snapshot row within the caller's transaction"""
+        # mode="json" already renders datetimes/enums as JSON-compatible values
+        segments_data = [seg.model_dump(mode="json") for seg in segments]
+        
+        snapshot_data = {
+            "segments": segments_data,
+            "timestamp": datetime.utcnow().isoformat(),
+            "count": len(segments)
+        }
+        
+        session.add(SnapshotModel(
+            id=str(uuid.uuid4()),
+            snapshot_data=snapshot_data,
+            segment_count=len(segments)
+        ))
     
     async def get_cached_segments(self, segment_type: str = None) -> List[RouteSegment]:
         """Get segments from cache"""
@@ -195,11 +210,11 @@ class AggregatorService:
                 result = await session.execute(stmt)
                 models = result.scalars().all()
                 
-                segments = []
-                for model in models:
-                    seg = RouteSegment(
+                # Rows were validated on the way in; construct without re-validating
+                return [
+                    RouteSegment.model_construct(
                         id=model.id,
-                        segment_type=model.segment_type,
+                        segment_type=SegmentType(model.segment_type),
                         from_asset=model.from_asset,
                         to_asset=model.to_asset,
                         from_network=model.from_network,
@@ -208,12 +223,11 @@ class AggregatorService:
                         latency=model.latency,
                         reliability_score=model.reliability_score,
                         constraints=model.constraints,
-                        provider=model.provider,
+                        provider=model.provider or None,
                         timestamp=model.timestamp,
                     )
-                    segments.append(seg)
-                
-                return segments
+                    for model in models
+                ]
             except Exception as e:
                 return []
     
@@ -233,8 +247,4 @@ class AggregatorService:
                 return {}
             except Exception as e:
                 return {}
-    
-    async def close(self):
-        """Close HTTP client"""
-        await self.http_client.aclose()
 
@@ -2,7 +2,7 @@
 ArgMax Decision Layer
 Normalizes and scores routes to select the optimal path using ArgMax.
 """
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 from app.schemas.route_segment import RouteSegment
 
@@ -13,6 +13,84 @@ try:
 except ImportError:
     HAS_NUMPY = False
 
+# Numba is optional: JIT-compiles the single-route selection kernel below
+try:
+    from numba import njit
+    HAS_NUMBA = HAS_NUMPY
+except ImportError:
+    HAS_NUMBA = False
+
+# Metrics read from each candidate, in score-column order
+_METRIC_KEYS = ('total_cost', 'total_latency', 'reliability')
+
+
+def top_k_order(scores: "np.ndarray", k: int) -> List[int]:
+    """
+    Indices of the k lowest scores, best first; ties keep input order, exactly
+    like np.argsort(scores, kind='stable')[:k].
+    """
+    if 0 < k < len(scores):
+        # O(N) partition for the k-th best score, then sort only the scores at
+        # or below it (ties included, so order stays stable)
+        kth = scores[np.argpartition(scores, k - 1)[k - 1]]
+        idx = np.flatnonzero(scores <= kth)
+        return idx[np.argsort(scores[idx], kind='stable')[:k]].tolist()
+    return np.argsort(scores, kind='stable')[:k].tolist()
+
+
+def _score_kernel(metrics_arr, alpha, beta, gamma):
+    """
+    Fused normalize + score + argmin over an (N, 3) metrics array.
+    
+    Same arithmetic as ArgMaxDecisionLayer._score_array, as explicit loops so
+    Numba can compile it without per-ufunc dispatch. Returns (best_idx, best_score).
+    """
+    n = metrics_arr.shape[0]
+    mn0 = mx0 = metrics_arr[0, 0]
+    mn1 = mx1 = metrics_arr[0, 1]
+    mn2 = mx2 = metrics_arr[0, 2]
+    for i in range(1, n):
+        c = metrics_arr[i, 0]
+        l = metrics_arr[i, 1]
+        r = metrics_arr[i, 2]
+        mn0 = min(mn0, c)
+        mx0 = max(mx0, c)
+        mn1 = min(mn1, l)
+        mx1 = max(mx1, l)
+        mn2 = min(mn2, r)
+        mx2 = max(mx2, r)
+    rng0 = mx0 - mn0 if mx0 > mn0 else 1.0
+    rng1 = mx1 - mn1 if mx1 > mn1 else 1.0
+    rng2 = mx2 - mn2 if mx2 > mn2 else 1.0
+    
+    best_idx = 0
+    best_score = 0.0
+    for i in range(n):
+        score = (
+            alpha * ((metrics_arr[i, 0] - mn0) / rng0) +
+            beta * ((metrics_arr[i, 1] - mn1) / rng1) +
+            gamma * (1.0 - (metrics_arr[i, 2] - mn2) / rng2)
+        )
+        # Strict < keeps the first of tied routes, like np.argmin
+        if i == 0 or score < best_score:
+            best_idx = i
+            best_score = score
+    return best_idx, best_score
+
+
+if HAS_NUMBA:
+    _score_kernel = njit(cache=True)(_score_kernel)
+
+
+def warm_score_kernel():
+    """
+    Compile (or load from Numba's on-disk cache) the selection kernel so the
+    first select_optimal_route doesn't pay for JIT on the request path.
+    Call once at startup; a no-op without Numba.
+    """
+    if HAS_NUMBA:
+        _score_kernel(np.zeros((2, 3), dtype=np.float64), 0.4, 0.3, 0.3)
+
 
 class ArgMaxDecisionLayer:
     """Decision layer for selecting optimal route using ArgMax"""
@@ -34,6 +112,85 @@ class ArgMaxDecisionLayer:
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
+        # (alpha, beta, gamma) as a float vector, rebuilt only if the weights change
+        self._weights_key: Optional[Tuple[float, float, float]] = None
+        self._weights = None
+    
+    def _weight_vector(self) -> "np.ndarray":
+        """Scoring weights as a reusable ndarray"""
+        weights = (self.alpha, self.beta, self.gamma)
+        if weights != self._weights_key:
+            self._weights = np.array(weights, dtype=np.float64)
+            self._weights_key = weights
+        return self._weights
+    
+    def _normalize_and_score(
+        self,
+        candidate_routes: List[Tuple[List[RouteSegment], Dict[str, float]]]
+    ):
+        """Scores for candidate_routes (ndarray with numpy, else list)"""
+        if HAS_NUMPY:
+            return self._score_array(candidate_routes)
+        return self._score_list(candidate_routes)
+    
+    @staticmethod
+    def _metrics_array(
+        candidate_routes: List[Tuple[List[RouteSegment], Dict[str, float]]]
+    ) -> "np.ndarray":
+        """(N, 3) float array of (cost, latency, reliability) per candidate"""
+        n = len(candidate_routes)
+        return np.fromiter(
+            (
+                metrics[key]
+                for _, metrics in candidate_routes
+                for key in _METRIC_KEYS
+            ),
+            dtype=np.float64,
+            count=3 * n
+        ).reshape(n, 3)
+    
+    def _score_array(
+        self,
+        candidate_routes: List[Tuple[List[RouteSegment], Dict[str, float]]]
+    ) -> "np.ndarray":
+        """
+        Min-max normalize (cost, latency, reliability) across candidates and
+        return the weighted score per route (lower is better).
+        """
+        metrics_arr = self._metrics_array(candidate_routes)
+        mn = metrics_arr.min(axis=0)
+        mx = metrics_arr.max(axis=0)
+        rng = np.where(mx > mn, mx - mn, 1.0)
+        norm = (metrics_arr - mn) / rng
+        # Reliability is higher-is-better; invert so every column is 0 = best
+        norm[:, 2] = 1.0 - norm[:, 2]
+        
+        return norm @ self._weight_vector()
+    
+    def _score_list(
+        self,
+        candidate_routes: List[Tuple[List[RouteSegment], Dict[str, float]]]
+    ) -> List[float]:
+        """Pure-Python equivalent of _score_array for environments without numpy"""
+        # One pass over the candidates, transposed into per-metric columns
+        costs, latencies, reliabilities = zip(*(
+            (metrics['total_cost'], metrics['total_latency'], metrics['reliability'])
+            for _, metrics in candidate_routes
+        ))
+        
+        min_cost, max_cost = min(costs), max(costs)
+        cost_range = max_cost - min_cost if max_cost > min_cost else 1.0
+        min_latency, max_latency = min(latencies), max(latencies)
+        latency_range = max_latency - min_latency if max_latency > min_latency else 1.0
+        min_reliability, max_reliability = min(reliabilities), max(reliabilities)
+        reliability_range = max_reliability - min_reliability if max_reliability > min_reliability else 1.0
+        
+        return [
+            self.alpha * (cost - min_cost) / cost_range +
+            self.beta * (latency - min_latency) / latency_range +
+            self.gamma * (1.0 - (reliability - min_reliability) / reliability_range)
+            for cost, latency, reliability in zip(costs, latencies, reliabilities)
+        ]
     
     def select_optimal_route(
         self,
@@ -51,56 +208,27 @@ class ArgMaxDecisionLayer:
         if not candidate_routes:
             return None, {}, 0.0
         
-        # Normalize metrics
-        normalized_routes = []
-        
-        # Extract all metrics for normalization
-        costs = [metrics['total_cost'] for _, metrics in candidate_routes]
-        latencies = [metrics['total_latency'] for _, metrics in candidate_routes]
-        reliabilities = [metrics['reliability'] for _, metrics in candidate_routes]
-        
-        # Calculate min/max for normalization
-        min_cost = min(costs) if costs else 0.0
-        max_cost = max(costs) if costs else 1.0
-        cost_range = max_cost - min_cost if max_cost > min_cost else 1.0
-        
-        min_latency = min(latencies) if latencies else 0.0
-        max_latency = max(latencies) if latencies else 1.0
-        latency_range = max_latency - min_latency if max_latency > min_latency else 1.0
-        
-        min_reliability = min(reliabilities) if reliabilities else 0.0
-        max_reliability = max(reliabilities) if reliabilities else 1.0
-        reliability_range = max_reliability - min_reliability if max_reliability > min_reliability else 1.0
+        if len(candidate_routes) == 1:
+            # Every range is degenerate: cost/latency normalize to 0, reliability to 1
+            optimal_path, optimal_metrics = candidate_routes[0]
+            return optimal_path, optimal_metrics, float(self.gamma)
         
-        # Normalize and score each route
-        for path, metrics in candidate_routes:
-            # Normalize cost (0 = best, 1 = worst)
-            norm_cost = (metrics['total_cost'] - min_cost) / cost_range if cost_range > 0 else 0.0
-            
-            # Normalize latency (0 = best, 1 = worst)
-            norm_latency = (metrics['total_latency'] - min_latency) / latency_range if latency_range > 0 else 0.0
-            
-            # Normalize reliability (0 = worst, 1 = best) - invert for consistency
-            norm_reliability = 1.0 - ((metrics['reliability'] - min_reliability) / reliability_range if reliability_range > 0 else 0.0)
-            
-            # Calculate score (lower is better)
-            score = (
-                self.alpha * norm_cost +
-                self.beta * norm_latency +
-                self.gamma * norm_reliability
+        # ArgMax: Find route with minimum score (best route)
+        if HAS_NUMBA:
+            optimal_idx, score = _score_kernel(
+                self._metrics_array(candidate_routes), self.alpha, self.beta, self.gamma
             )
-            
-            normalized_routes.append((path, metrics, score))
+            optimal_path, optimal_metrics = candidate_routes[optimal_idx]
+            return optimal_path, optimal_metrics, float(score)
         
-        # ArgMax: Find route with minimum score (best route)
+        scores = self._normalize_and_score(candidate_routes)
         if HAS_NUMPY:
-            optimal_idx = np.argmin([score for _, _, score in normalized_routes])
+            optimal_idx = int(np.argmin(scores))
         else:
-            # Manual argmin
-            optimal_idx = min(range(len(normalized_routes)), key=lambda i: normalized_routes[i][2])
-        optimal_path, optimal_metrics, optimal_score = normalized_routes[optimal_idx]
+            optimal_idx = min(range(len(scores)), key=scores.__getitem__)
         
-        return optimal_path, optimal_metrics, optimal_score
+        optimal_path, optimal_metrics = candidate_routes[optimal_idx]
+        return optimal_path, optimal_metrics, float(scores[optimal_idx])
     
     def rank_routes(
         self,
@@ -116,40 +244,18 @@ class ArgMaxDecisionLayer:
         if not candidate_routes:
             return []
         
-        # Normalize and score (same as select_optimal_route)
-        normalized_routes = []
-        
-        costs = [metrics['total_cost'] for _, metrics in candidate_routes]
-        latencies = [metrics['total_latency'] for _, metrics in candidate_routes]
-        reliabilities = [metrics['reliability'] for _, metrics in candidate_routes]
-        
-        min_cost = min(costs) if costs else 0.0
-        max_cost = max(costs) if costs else 1.0
-        cost_range = max_cost - min_cost if max_cost > min_cost else 1.0
-        
-        min_latency = min(latencies) if latencies else 0.0
-        max_latency = max(latencies) if latencies else 1.0
-        latency_range = max_latency - min_latency if max_latency > min_latency else 1.0
-        
-        min_reliability = min(reliabilities) if reliabilities else 0.0
-        max_reliability = max(reliabilities) if reliabilities else 1.0
-        reliability_range = max_reliability - min_reliability if max_reliability > min_reliability else 1.0
+        if len(candidate_routes) == 1:
+            path, metrics = candidate_routes[0]
+            return [(path, metrics, float(self.gamma))] if top_k > 0 else []
         
-        for path, metrics in candidate_routes:
-            norm_cost = (metrics['total_cost'] - min_cost) / cost_range if cost_range > 0 else 0.0
-            norm_latency = (metrics['total_latency'] - min_latency) / latency_range if latency_range > 0 else 0.0
-            norm_reliability = 1.0 - ((metrics['reliability'] - min_reliability) / reliability_range if reliability_range > 0 else 0.0)
-            
-            score = (
-                self.alpha * norm_cost +
-                self.beta * norm_latency +
-                self.gamma * norm_reliability
-            )
-            
-            normalized_routes.append((path, metrics, score))
-        
-        # Sort by score (lower is better)
-        sorted_routes = sorted(normalized_routes, key=lambda x: x[2])
+        # Sort by score (lower is better); stable so ties keep candidate order
+        scores = self._normalize_and_score(candidate_routes)
+        if HAS_NUMPY:
+            order = top_k_order(scores, top_k)
+        else:
+            order = sorted(range(len(scores)), key=scores.__getitem__)[:top_k]
         
-        return sorted_routes[:top_k]
-
+        return [
+            (candidate_routes[i][0], candidate_routes[i][1], float(scores[i]))
+            for i in order
+        ]
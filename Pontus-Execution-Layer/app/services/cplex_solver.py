@@ -4,13 +4,21 @@ Uses IBM CPLEX for mixed-integer programming and advanced optimization.
 Note: CPLEX requires separate installation. Falls back gracefully if not available.
 """
 from typing import List, Dict, Optional, Tuple
+import heapq
 import logging
+import threading
+
+import numpy as np
 
 from app.schemas.route_segment import RouteSegment
 from app.services.graph_builder import RouteGraph
+from app.services.argmax_decision import top_k_order
 
 logger = logging.getLogger(__name__)
 
+# Edge-cost cache is dropped wholesale once it holds this many segments
+_EDGE_COST_CACHE_MAXSIZE = 50000
+
 # Try to import CPLEX
 try:
     import cplex
@@ -47,6 +55,29 @@ class CPLEXSolver:
         self.cost_weight = cost_weight
         self.latency_weight = latency_weight
         self.reliability_weight = reliability_weight
+        # (id(segment), weights) -> (segment, edge cost); the segment ref keeps the id valid
+        self._edge_cost_cache: Dict[Tuple[int, Tuple[float, float, float]], Tuple[RouteSegment, float]] = {}
+        # One reusable Cplex model per thread (models are not thread-safe)
+        self._local = threading.local()
+    
+    def _acquire_model(self) -> "cplex.Cplex":
+        """This thread's pooled model, emptied of the previous solve's rows and columns"""
+        model = getattr(self._local, "model", None)
+        if model is None:
+            model = cplex.Cplex()
+            model.set_results_stream(None)  # Suppress output
+            self._local.model = model
+        else:
+            model.linear_constraints.delete()
+            model.variables.delete()
+        return model
+    
+    def _discard_model(self):
+        """End and drop this thread's pooled model (e.g. after a failed solve)"""
+        model = getattr(self._local, "model", None)
+        if model is not None:
+            self._local.model = None
+            model.end()
     
     def solve_mip(
         self,
@@ -54,58 +85,49 @@ class CPLEXSolver:
         from_asset: str,
         to_asset: str,
         from_network: Optional[str] = None,
-        to_network: Optional[str] = None
+        to_network: Optional[str] = None,
+        use_mip: bool = False
     ) -> Optional[List[RouteSegment]]:
         """
         Solve routing problem using Mixed-Integer Programming.
         Uses binary variables to select edges in the path.
+        
+        Edge costs are non-negative, so without side constraints this is a plain
+        shortest-path problem: unless use_mip is set, it is answered with
+        Dijkstra and CPLEX is not invoked.
         """
-        # Build node mapping
-        nodes = list(graph.nodes)
-        node_to_index = {node: i for i, node in enumerate(nodes)}
+        # Node mapping and best-segment edge list, cached on the graph per weight set
+        nodes, node_to_index, edges, edge_to_segment = graph.get_mip_view(
+            self._calculate_edge_cost,
+            (self.cost_weight, self.latency_weight, self.reliability_weight)
+        )
         
         # Identify start and end nodes
         start_node = f"{from_asset}@{from_network}" if from_network else from_asset
         end_node = f"{to_asset}@{to_network}" if to_network else to_asset
         
-        start_idx = node_to_index.get(start_node) or node_to_index.get(from_asset)
-        end_idx = node_to_index.get(end_node) or node_to_index.get(to_asset)
+        # Explicit None checks: index 0 is a valid node
+        start_idx = node_to_index.get(start_node)
+        if start_idx is None:
+            start_idx = node_to_index.get(from_asset)
+        end_idx = node_to_index.get(end_node)
+        if end_idx is None:
+            end_idx = node_to_index.get(to_asset)
         
         if start_idx is None or end_idx is None:
             return None
         
-        # Build edge list with costs
-        edges = []
-        edge_to_segment = {}
-        edge_index = 0
-        
-        for from_node, neighbors in graph.graph.items():
-            from_idx = node_to_index[from_node]
-            
-            for to_node, segments_list in neighbors.items():
-                to_idx = node_to_index[to_node]
-                
-                # Find best segment
-                best_segment = None
-                best_cost = float('inf')
-                
-                for segment in segments_list:
-                    cost = self._calculate_edge_cost(segment)
-                    if cost < best_cost:
-                        best_cost = cost
-                        best_segment = segment
-                
-                if best_segment:
-                    edges.append((from_idx, to_idx, best_cost))
-                    edge_to_segment[edge_index] = best_segment
-                    edge_index += 1
-        
         if not edges:
             return None
         
-        # Create CPLEX model
-        model = cplex.Cplex()
-        model.set_results_stream(None)  # Suppress output
+        if not use_mip:
+            edge_path = self._shortest_edge_path(len(nodes), edges, start_idx, end_idx)
+            if not edge_path:
+                return None
+            return [edge_to_segment[i] for i in edge_path]
+        
+        # Reuse this thread's CPLEX model instead of constructing one per solve
+        model = self._acquire_model()
         
         # Variables: binary for each edge (1 if used, 0 otherwise)
         var_names = [f"edge_{i}" for i in range(len(edges))]
@@ -118,44 +140,33 @@ class CPLEXSolver:
         )
         
         # Constraints: Flow conservation
+        # Bucket edge variables per node in one pass: +1 incoming, -1 outgoing
+        node_vars = [[] for _ in range(len(nodes))]
+        node_coeffs = [[] for _ in range(len(nodes))]
+        for i, (from_idx, to_idx, _) in enumerate(edges):
+            node_vars[to_idx].append(i)
+            node_coeffs[to_idx].append(1.0)
+            node_vars[from_idx].append(i)
+            node_coeffs[from_idx].append(-1.0)
+        
         # For each node: sum(incoming) - sum(outgoing) = supply
         for node_idx in range(len(nodes)):
-            incoming = []
-            outgoing = []
-            
-            for i, (from_idx, to_idx, _) in enumerate(edges):
-                if to_idx == node_idx:
-                    incoming.append(var_names[i])
-                if from_idx == node_idx:
-                    outgoing.append(var_names[i])
+            if not node_vars[node_idx]:
+                continue
             
-            # Supply: +1 for start, -1 for end, 0 for others
+            # Net inflow: -1 at start (one edge out), +1 at end (one edge in), 0 otherwise
             if node_idx == start_idx:
-                supply = 1
-            elif node_idx == end_idx:
                 supply = -1
+            elif node_idx == end_idx:
+                supply = 1
             else:
                 supply = 0
             
-            # Constraint: sum(incoming) - sum(outgoing) = supply
-            if incoming or outgoing:
-                constraint = []
-                coeffs = []
-                
-                for var in incoming:
-                    constraint.append([(var_names.index(var), 1.0)])
-                    coeffs.append(1.0)
-                
-                for var in outgoing:
-                    constraint.append([(var_names.index(var), -1.0)])
-                    coeffs.append(-1.0)
-                
-                if constraint:
-                    model.linear_constraints.add(
-                        lin_expr=constraint,
-                        senses=['E'],
-                        rhs=[supply]
-                    )
+            model.linear_constraints.add(
+                lin_expr=[cplex.SparsePair(ind=node_vars[node_idx], val=node_coeffs[node_idx])],
+                senses=['E'],
+                rhs=[supply]
+            )
         
         # Solve
         try:
@@ -168,31 +179,70 @@ class CPLEXSolver:
             solution = model.solution.get_values()
             path_segments = []
             
-            # Reconstruct path
+            # Reconstruct path: from_idx -> (edge index, to_idx) for selected edges;
+            # popping each hop also guards against revisiting a node
+            selected = {
+                from_idx: (i, to_idx)
+                for i, (from_idx, to_idx, _) in enumerate(edges)
+                if solution[i] > 0.5
+            }
             current = start_idx
-            visited_edges = set()
             
             while current != end_idx:
-                found = False
-                for i, (from_idx, to_idx, _) in enumerate(edges):
-                    if from_idx == current and solution[i] > 0.5 and i not in visited_edges:
-                        segment = edge_to_segment[i]
-                        path_segments.append(segment)
-                        current = to_idx
-                        visited_edges.add(i)
-                        found = True
-                        break
-                
-                if not found:
+                i, next_idx = selected.pop(current, (None, None))
+                if i is None:
                     return None
+                path_segments.append(edge_to_segment[i])
+                current = next_idx
             
             return path_segments if path_segments else None
             
         except Exception as e:
             logger.error(f"CPLEX solve error: {e}")
+            # Don't hand a model in an unknown state to the next solve
+            self._discard_model()
             return None
-        finally:
-            model.end()
+    
+    @staticmethod
+    def _shortest_edge_path(
+        num_nodes: int,
+        edges: List[Tuple[int, int, float]],
+        start_idx: int,
+        end_idx: int
+    ) -> Optional[List[int]]:
+        """Dijkstra over (from_idx, to_idx, cost) edges; returns edge indices from start to end"""
+        adjacency: List[List[Tuple[int, int, float]]] = [[] for _ in range(num_nodes)]
+        for i, (from_idx, to_idx, cost) in enumerate(edges):
+            adjacency[from_idx].append((to_idx, i, cost))
+        
+        dist = {start_idx: 0.0}
+        via_edge: Dict[int, int] = {}
+        heap = [(0.0, start_idx)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == end_idx:
+                break
+            if d > dist[node]:
+                continue
+            for to_idx, i, cost in adjacency[node]:
+                nd = d + cost
+                if nd < dist.get(to_idx, float('inf')):
+                    dist[to_idx] = nd
+                    via_edge[to_idx] = i
+                    heapq.heappush(heap, (nd, to_idx))
+        
+        if end_idx not in via_edge:
+            return None
+        
+        # Walk predecessor edges back from the end node
+        edge_path = []
+        node = end_idx
+        while node != start_idx:
+            i = via_edge[node]
+            edge_path.append(i)
+            node = edges[i][0]
+        edge_path.reverse()
+        return edge_path
     
     def solve_multi_objective(
         self,
@@ -212,26 +262,34 @@ class CPLEXSolver:
         if not all_paths:
             return []
         
-        # Calculate metrics for each path
-        path_metrics = []
-        for path in all_paths:
-            metrics = self._calculate_path_metrics(path)
-            path_metrics.append((path, metrics))
+        # Calculate metrics for each path (feature totals for all paths in one pass),
+        # plus its dedup signature, computed once here rather than per sort order
+        totals = graph.path_feature_totals(all_paths).tolist()
+        path_metrics = [
+            (path, self._metrics_from_totals(*row, len(path)), tuple(seg.id for seg in path if seg.id))
+            for path, row in zip(all_paths, totals)
+        ]
         
-        # Use CPLEX to solve weighted combinations
-        # For now, return top paths sorted by different objectives
-        cost_sorted = sorted(path_metrics, key=lambda x: x[1]['total_cost'])
-        latency_sorted = sorted(path_metrics, key=lambda x: x[1]['total_latency'])
-        reliability_sorted = sorted(path_metrics, key=lambda x: -x[1]['reliability'])
-        combined_sorted = sorted(path_metrics, key=lambda x: x[1]['combined_score'])
+        # Objective columns (lower is better): cost, latency, -reliability, combined score
+        n = len(path_metrics)
+        objectives = np.fromiter(
+            (
+                metrics[key]
+                for _, metrics, _ in path_metrics
+                for key in ('total_cost', 'total_latency', 'reliability', 'combined_score')
+            ),
+            dtype=np.float64,
+            count=4 * n
+        ).reshape(n, 4)
+        objectives[:, 2] *= -1.0
         
-        # Collect unique top paths
+        # Collect unique top paths: best max_paths per objective, in objective order
         seen_paths = set()
         result = []
         
-        for path_list in [cost_sorted, latency_sorted, reliability_sorted, combined_sorted]:
-            for path, metrics in path_list[:max_paths]:
-                path_id = tuple(seg.id for seg in path if seg.id)
+        for column in range(4):
+            for i in top_k_order(objectives[:, column], max_paths):
+                path, metrics, path_id = path_metrics[i]
                 if path_id not in seen_paths:
                     seen_paths.add(path_id)
                     result.append((path, metrics))
@@ -243,12 +301,25 @@ class CPLEXSolver:
         return result
     
     def _calculate_edge_cost(self, segment: RouteSegment) -> float:
+        """Combined edge cost, memoized per segment object and weight set"""
+        key = (id(segment), (self.cost_weight, self.latency_weight, self.reliability_weight))
+        cached = self._edge_cost_cache.get(key)
+        if cached is not None and cached[0] is segment:
+            return cached[1]
+        
+        cost = self._compute_edge_cost(segment)
+        if len(self._edge_cost_cache) >= _EDGE_COST_CACHE_MAXSIZE:
+            self._edge_cost_cache.clear()
+        self._edge_cost_cache[key] = (segment, cost)
+        return cost
+    
+    def _compute_edge_cost(self, segment: RouteSegment) -> float:
         """Calculate combined edge cost"""
-        fee_percent = segment.cost.get('fee_percent', 0.0)
-        fixed_fee = segment.cost.get('fixed_fee', 0.0)
+        fee_percent = segment.fee_percent
+        fixed_fee = segment.fixed_fee
         
-        min_latency = segment.latency.get('min_minutes', 0)
-        max_latency = segment.latency.get('max_minutes', 0)
+        min_latency = segment.min_minutes
+        max_latency = segment.max_minutes
         avg_latency = (min_latency + max_latency) / 2 if max_latency > 0 else min_latency
         latency_cost = avg_latency / 60.0
         
@@ -268,16 +339,39 @@ class CPLEXSolver:
         total_fixed_fee = 0.0
         total_min_latency = 0
         total_max_latency = 0
-        reliability_scores = []
+        total_reliability = 0.0
         
         for segment in path:
-            total_cost_percent += segment.cost.get('fee_percent', 0.0)
-            total_fixed_fee += segment.cost.get('fixed_fee', 0.0)
-            total_min_latency += segment.latency.get('min_minutes', 0)
-            total_max_latency += segment.latency.get('max_minutes', 0)
-            reliability_scores.append(segment.reliability_score)
+            total_cost_percent += segment.fee_percent
+            total_fixed_fee += segment.fixed_fee
+            total_min_latency += segment.min_minutes
+            total_max_latency += segment.max_minutes
+            total_reliability += segment.reliability_score
         
-        avg_reliability = sum(reliability_scores) / len(reliability_scores) if reliability_scores else 0.0
+        avg_reliability = total_reliability / len(path) if path else 0.0
+        
+        return self._metrics_from_totals(
+            total_cost_percent,
+            total_fixed_fee,
+            total_min_latency,
+            total_max_latency,
+            avg_reliability,
+            len(path)
+        )
+    
+    def _metrics_from_totals(
+        self,
+        total_cost_percent: float,
+        total_fixed_fee: float,
+        total_min_latency: float,
+        total_max_latency: float,
+        avg_reliability: float,
+        num_segments: int
+    ) -> Dict[str, float]:
+        """Build the path metrics dict from summed segment features"""
+        # Latencies are whole minutes; the float64 feature matrix must not leak into responses
+        total_min_latency = int(total_min_latency)
+        total_max_latency = int(total_max_latency)
         avg_latency_hours = ((total_min_latency + total_max_latency) / 2) / 60.0
         
         combined_score = (
@@ -295,6 +389,6 @@ class CPLEXSolver:
             'max_latency': total_max_latency,
             'reliability': avg_reliability,
             'combined_score': combined_score,
-            'num_segments': len(path)
+            'num_segments': num_segments
         }
 
@@ -1,10 +1,13 @@
 """
 Advanced Execution Service with Dynamic Re-routing, Pause/Resume, and Parallel Execution
 """
-import uuid
 import asyncio
+import itertools
 import logging
-from typing import List, Dict, Any, Optional, Set
+import secrets
+import time
+from typing import List, Dict, Any, Optional, Set, Callable, Tuple
+import httpx
 from datetime import datetime
 from enum import Enum
 
@@ -30,11 +33,50 @@ from app.services.execution.segment_executors import (
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
 from app.clients import WiseClient, KrakenClient
+from app.infra.http_client import get_http_client
+from app.infra import singleflight
 from app.config import settings
-import httpx
 
 logger = logging.getLogger(__name__)
 
+# Memoized route lookups; entries also expire so quotes can't go stale indefinitely
+_ROUTE_CACHE_MAXSIZE = 512
+_ROUTE_CACHE_TTL = 30.0
+
+# Provider cancellation calls in flight at once per cancel_execution
+_CANCEL_CONCURRENCY = 10
+
+# segment_type string -> SegmentType, skipping the Enum constructor's lookup per segment
+_SEGMENT_TYPES = {segment_type.value: segment_type for segment_type in SegmentType}
+
+# Segment types that are independent enough to run side by side
+_PARALLELIZABLE_TYPES = frozenset({"fx", "crypto"})
+
+
+def _reroute_decision(
+    alt_cost: float,
+    remaining_cost_estimate: float,
+    alt_latency: float,
+    total_latency: float,
+    alt_reliability: float,
+    cost_threshold: float,
+    latency_threshold: float,
+    reliability_threshold: float
+) -> bool:
+    """
+    Whether the alternative route beats the remaining one by more than the
+    thresholds (percent for cost/latency), or is reliable enough on its own.
+    
+    The percent-change tests are cross-multiplied, so there is no division and
+    no zero-denominator branch: with a zero estimate the alternative can't
+    count as cheaper/faster, as before.
+    """
+    return (
+        (alt_cost - remaining_cost_estimate) * 100 < -cost_threshold * remaining_cost_estimate or  # Better cost
+        (alt_latency - total_latency) * 100 < -latency_threshold * total_latency or  # Better latency
+        alt_reliability > reliability_threshold  # High reliability alternative
+    )
+
 
 class ExecutionState(Enum):
     """Execution state for pause/resume"""
@@ -47,14 +89,19 @@ class ExecutionState(Enum):
 class AdvancedExecutionService:
     """Advanced execution service with dynamic re-routing, pause/resume, and parallel execution"""
     
-    def __init__(self, routing_service: RoutingService, aggregator_service: AggregatorService):
+    def __init__(
+        self,
+        routing_service: RoutingService,
+        aggregator_service: AggregatorService,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.routing_service = routing_service
         self.aggregator_service = aggregator_service
         self.simulator = Simulator()
         self.execution_mode = settings.execution_mode
         
-        # Initialize API clients
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Initialize API clients (on the app-owned shared client unless one is injected)
+        self.http_client = http_client or get_http_client()
         self.wise_client = WiseClient(self.http_client) if settings.wise_api_key else None
         self.kraken_client = KrakenClient(self.http_client) if settings.kraken_api_key else None
         
@@ -72,9 +119,16 @@ class AdvancedExecutionService:
         self.active_executions: Dict[str, Dict[str, Any]] = {}
         self.execution_states: Dict[str, ExecutionState] = {}
         self.execution_locks: Dict[str, asyncio.Lock] = {}
+        self.resume_events: Dict[str, asyncio.Event] = {}  # set while not paused
+        self.reroute_events: Dict[str, asyncio.Event] = {}  # set while no re-route is pending
         self.transaction_ids: Dict[str, Dict[int, Dict[str, str]]] = {}  # execution_id -> segment_index -> {provider: tx_id}
         self.max_execution_history = 1000
         
+        # (from_asset, to_asset, from_network, to_network, segments_version) -> (route result, cached_at)
+        self._route_cache: Dict[Tuple, Tuple[Dict[str, Any], float]] = {}
+        # (segments_version, segments, fetched_at) of the last aggregator fetch
+        self._segments_snapshot: Optional[Tuple[int, List[Any], float]] = None
+        
         # AI decision making for re-routing
         self.reroute_thresholds = {
             "cost_increase_percent": 5.0,  # Re-route if cost increases by 5%
@@ -86,7 +140,8 @@ class AdvancedExecutionService:
         self,
         request: RouteExecutionRequest,
         parallel: bool = False,
-        enable_ai_rerouting: bool = True
+        enable_ai_rerouting: bool = True,
+        on_segment: Optional[Callable[[SegmentExecutionResult], None]] = None
     ) -> RouteExecutionResponse:
         """
         Execute route with advanced features
@@ -95,10 +150,15 @@ class AdvancedExecutionService:
             request: Route execution request
             parallel: Enable parallel execution where possible
             enable_ai_rerouting: Enable AI-based dynamic re-routing
+            on_segment: Called with each segment result as soon as it completes
         """
-        execution_id = str(uuid.uuid4())
+        # Opaque URL-safe id (128 random bits); cheaper to mint than str(uuid.uuid4())
+        execution_id = secrets.token_urlsafe(16)
         started_at = datetime.utcnow()
         
+        if len(self.active_executions) >= self.max_execution_history:
+            self._evict_finished()
+        
         # Initialize execution state
         self.active_executions[execution_id] = {
             "status": ExecutionStatus.IN_PROGRESS,
@@ -111,10 +171,18 @@ class AdvancedExecutionService:
             "ai_rerouting": enable_ai_rerouting,
             "original_route": None,
             "current_amount": request.amount,
-            "wallet_address": None
+            "wallet_address": None,
+            # Running totals over completed segments, read by _build_response
+            "total_fees": 0.0,
+            "confirmation_minutes_total": 0,
+            "finished": False
         }
         self.execution_states[execution_id] = ExecutionState.RUNNING
         self.execution_locks[execution_id] = asyncio.Lock()
+        self.resume_events[execution_id] = asyncio.Event()
+        self.resume_events[execution_id].set()
+        self.reroute_events[execution_id] = asyncio.Event()
+        self.reroute_events[execution_id].set()
         self.transaction_ids[execution_id] = {}
         
         try:
@@ -126,13 +194,17 @@ class AdvancedExecutionService:
             route_segments = route_result["route"]
             self.active_executions[execution_id]["route"] = route_segments
             self.active_executions[execution_id]["total_segments"] = len(route_segments)
-            self.active_executions[execution_id]["original_route"] = route_segments.copy()
+            # Route lists are never mutated in place: a reroute swaps in a new list,
+            # so the original can be shared instead of snapshotted
+            self.active_executions[execution_id]["original_route"] = route_segments
             
             # Execute route
             if parallel:
-                result = await self._execute_parallel(execution_id, route_segments, request)
+                # Grouped once at ingestion; dropped again if the route is replaced
+                self.active_executions[execution_id]["parallel_groups"] = self._group_parallel_segments(route_segments)
+                result = await self._execute_parallel(execution_id, route_segments, request, on_segment)
             else:
-                result = await self._execute_sequential(execution_id, route_segments, request, enable_ai_rerouting)
+                result = await self._execute_sequential(execution_id, route_segments, request, enable_ai_rerouting, on_segment)
             
             return result
             
@@ -156,70 +228,196 @@ class AdvancedExecutionService:
                 completed_at=datetime.utcnow(),
                 error_message=str(e)
             )
+        finally:
+            self.active_executions[execution_id]["finished"] = True
+            # Nothing waits on the event once the run is over
+            self.resume_events.pop(execution_id, None)
+            self.reroute_events.pop(execution_id, None)
+    
+    def _evict_finished(self):
+        """
+        Drop the oldest finished executions (dicts keep insertion order) until the
+        history is back under max_execution_history. Running executions are never
+        evicted, so the per-execution state they read stays in place.
+        """
+        excess = len(self.active_executions) - self.max_execution_history + 1
+        # Stops at the excess-th finished entry instead of scanning the whole history
+        evicted = list(itertools.islice(
+            (
+                execution_id for execution_id, exec_data in self.active_executions.items()
+                if exec_data.get("finished")
+            ),
+            max(excess, 0)
+        ))
+        for execution_id in evicted:
+            del self.active_executions[execution_id]
+            self.execution_states.pop(execution_id, None)
+            self.execution_locks.pop(execution_id, None)
+            self.transaction_ids.pop(execution_id, None)
+        if evicted and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Evicted %d finished executions from history", len(evicted))
     
     async def _get_optimal_route(self, request: RouteExecutionRequest) -> Dict[str, Any]:
         """Get optimal route"""
-        segments = await self.aggregator_service.get_cached_segments()
-        if not segments:
+        route_result = await self._cached_find_route(
+            request.from_asset, request.to_asset, request.from_network, request.to_network
+        )
+        if route_result is None:
+            return {"error": "No route segments available"}
+        return route_result
+    
+    async def _cached_find_route(
+        self,
+        from_asset: str,
+        to_asset: str,
+        from_network: Optional[str],
+        to_network: Optional[str],
+        use_db_fallback: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        routing_service.find_optimal_route over the current segments, memoized per
+        (assets, networks, segments_version, use_db_fallback) for up to 30s. Error
+        results are not cached. Concurrent misses for the same key (e.g. re-route
+        probes from parallel executions) share one search.
+        
+        Returns None when no segments are available.
+        """
+        key = (
+            from_asset, to_asset, from_network, to_network,
+            self.aggregator_service.segments_version, use_db_fallback
+        )
+        cached = self._route_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < _ROUTE_CACHE_TTL:
+            return self._copy_route_result(cached[0])
+        
+        result = await singleflight.do(f"route:{id(self)}:{key}", lambda: self._find_route(key))
+        return self._copy_route_result(result) if result is not None else None
+    
+    async def _find_route(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Cache miss path for _cached_find_route: load segments, search, store"""
+        from_asset, to_asset, from_network, to_network, segments_version, use_db_fallback = key
+        segments = await self._cached_segments(segments_version)
+        if not segments and use_db_fallback:
             segments = await self.aggregator_service.get_segments_from_db(limit=1000)
         
         if not segments:
-            return {"error": "No route segments available"}
+            return None
         
-        return self.routing_service.find_optimal_route(
+        result = self.routing_service.find_optimal_route(
             segments=segments,
-            from_asset=request.from_asset,
-            to_asset=request.to_asset,
-            from_network=request.from_network,
-            to_network=request.to_network
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_network=from_network,
+            to_network=to_network
         )
+        
+        # A "No route found" may be transient; let the next lookup search again
+        if "error" in result:
+            return result
+        
+        self._route_cache.pop(key, None)
+        if len(self._route_cache) >= _ROUTE_CACHE_MAXSIZE:
+            del self._route_cache[next(iter(self._route_cache))]
+        self._route_cache[key] = (result, time.monotonic())
+        return result
+    
+    async def _cached_segments(self, segments_version: int) -> List[Any]:
+        """
+        Aggregator's cached segments, fetched once per segments_version (and at
+        most every 30s) and shared by route lookups for different legs, e.g. the
+        initial route and later re-route probes.
+        """
+        snapshot = self._segments_snapshot
+        if (
+            snapshot is not None
+            and snapshot[0] == segments_version
+            and time.monotonic() - snapshot[2] < _ROUTE_CACHE_TTL
+        ):
+            return snapshot[1]
+        
+        segments = await self.aggregator_service.get_cached_segments()
+        if segments:
+            self._segments_snapshot = (segments_version, segments, time.monotonic())
+        return segments
+    
+    @staticmethod
+    def _copy_route_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-caller copy of a shared route result; callers may replace the route
+        list, while the segment dicts inside it are treated as read-only"""
+        return {**result, "route": list(result["route"])} if "route" in result else dict(result)
     
     async def _execute_sequential(
         self,
         execution_id: str,
         route_segments: List[Dict[str, Any]],
         request: RouteExecutionRequest,
-        enable_ai_rerouting: bool
+        enable_ai_rerouting: bool,
+        on_segment: Optional[Callable[[SegmentExecutionResult], None]] = None
     ) -> RouteExecutionResponse:
         """Execute segments sequentially with AI re-routing"""
         segment_executions: List[SegmentExecutionResult] = []
         current_amount = request.amount
         wallet_address = None
         
-        for idx, segment_dict in enumerate(route_segments):
-            # Check if execution was cancelled or paused
-            async with self.execution_locks[execution_id]:
+        # Index-driven so a re-route (which keeps the executed prefix) is picked up in place
+        idx = 0
+        rerouted_at = None
+        while idx < len(route_segments):
+            segment_dict = route_segments[idx]
+            # Check if execution was cancelled or paused. A plain read is enough:
+            # the state is only written under the lock and nothing awaits between
+            # this read and acting on it.
+            state = self.execution_states.get(execution_id)
+            if state == ExecutionState.PAUSED:
+                await self._wait_for_resume(execution_id)
                 state = self.execution_states.get(execution_id)
-                if state == ExecutionState.CANCELLING:
-                    return await self._handle_cancellation(execution_id, segment_executions, request.amount)
-                elif state == ExecutionState.PAUSED:
-                    await self._wait_for_resume(execution_id)
-                elif state == ExecutionState.REROUTING:
-                    # Re-routing in progress, wait
-                    await asyncio.sleep(0.1)
-                    continue
-            
-            # AI-based re-routing check
-            if enable_ai_rerouting and idx > 0:
+            if state == ExecutionState.CANCELLING:
+                return await self._handle_cancellation(execution_id, segment_executions, request.amount)
+            elif state == ExecutionState.REROUTING:
+                # An external re-route is in progress; continue on its route once installed
+                event = self.reroute_events.get(execution_id)
+                if event is not None:
+                    await event.wait()
+                route_segments = self.active_executions[execution_id]["route"]
+                continue
+            
+            # AI-based re-routing check (once per position, so a fresh route isn't re-probed)
+            if enable_ai_rerouting and idx > 0 and rerouted_at != idx:
                 should_reroute = await self._should_reroute(execution_id, idx, current_amount, request)
                 if should_reroute:
                     logger.info(f"Execution {execution_id}: AI decision to re-route at segment {idx}")
                     new_route = await self._calculate_reroute(execution_id, idx, current_amount, request)
                     if new_route:
                         route_segments = new_route
-                        self.active_executions[execution_id]["route"] = route_segments
-                        self.active_executions[execution_id]["total_segments"] = len(route_segments)
+                        self._install_route(execution_id, route_segments)
+                        rerouted_at = idx
                         # Continue with new route
                         continue
             
+            # Warm the next re-route probe's route lookup while this segment runs, but
+            # only once drift makes a probe search likely; otherwise the precheck skips it
+            prefetch = None
+            if (
+                enable_ai_rerouting and idx + 1 < len(route_segments) and
+                self._drift_exceeds_thresholds(self.active_executions[execution_id])
+            ):
+                prefetch = asyncio.create_task(self._prefetch_route(route_segments[idx + 1], request))
+            
             # Execute segment
             segment_result = await self._execute_segment(
                 execution_id, idx, segment_dict, current_amount, wallet_address
             )
+            if prefetch is not None:
+                await prefetch
             
             segment_executions.append(segment_result)
+            if on_segment:
+                on_segment(segment_result)
             self.active_executions[execution_id]["segment_executions"] = segment_executions
             self.active_executions[execution_id]["current_segment"] = idx + 1
+            self.active_executions[execution_id]["total_fees"] += segment_result.fees_paid
+            self.active_executions[execution_id]["confirmation_minutes_total"] += segment_result.confirmation_time_minutes or 0
+            self.active_executions[execution_id]["last_segment_drift"] = self._segment_drift(segment_dict, segment_result)
             
             # Update wallet address if generated
             if segment_result.simulation_data.get("wallet_address"):
@@ -234,6 +432,7 @@ class AdvancedExecutionService:
             # Update current amount
             current_amount = segment_result.output_amount
             self.active_executions[execution_id]["current_amount"] = current_amount
+            idx += 1
         
         # Calculate final result
         return await self._build_response(execution_id, route_segments, segment_executions, request.amount, current_amount, request)
@@ -242,30 +441,41 @@ class AdvancedExecutionService:
         self,
         execution_id: str,
         route_segments: List[Dict[str, Any]],
-        request: RouteExecutionRequest
+        request: RouteExecutionRequest,
+        on_segment: Optional[Callable[[SegmentExecutionResult], None]] = None
     ) -> RouteExecutionResponse:
         """Execute segments in parallel where possible"""
         # Group segments that can run in parallel (independent segments)
-        parallel_groups = self._group_parallel_segments(route_segments)
+        parallel_groups = self.active_executions[execution_id].get("parallel_groups")
+        if parallel_groups is None:
+            parallel_groups = self._group_parallel_segments(route_segments)
         
         segment_executions: List[SegmentExecutionResult] = []
         current_amount = request.amount
         wallet_address = None
+        exec_data = self.active_executions[execution_id]
+        # Shared with the status API so completed segments show up as they land
+        exec_data["segment_executions"] = segment_executions
+        
+        async def run_segment(seg_idx: int, segment_dict: Dict[str, Any], input_amount: float, wallet: Optional[str]):
+            try:
+                return seg_idx, await self._execute_segment(
+                    execution_id, seg_idx, segment_dict, input_amount, wallet
+                )
+            except Exception as e:
+                return seg_idx, e
         
         for group_idx, group in enumerate(parallel_groups):
             # Execute group in parallel
-            tasks = []
-            for seg_idx, segment_dict in group:
-                task = self._execute_segment(
-                    execution_id, seg_idx, segment_dict, current_amount, wallet_address
-                )
-                tasks.append((seg_idx, task))
-            
-            # Wait for all segments in group to complete
-            results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-            
-            # Process results
-            for (seg_idx, _), result in zip(tasks, results):
+            group_start = len(segment_executions)
+            tasks = [
+                asyncio.create_task(run_segment(seg_idx, segment_dict, current_amount, wallet_address))
+                for seg_idx, segment_dict in group
+            ]
+            
+            # Process each segment as soon as it finishes, not after the slowest one
+            for next_done in asyncio.as_completed(tasks):
+                seg_idx, result = await next_done
                 if isinstance(result, Exception):
                     segment_result = SegmentExecutionResult(
                         segment_index=seg_idx,
@@ -282,17 +492,25 @@ class AdvancedExecutionService:
                     segment_result = result
                 
                 segment_executions.append(segment_result)
-                
-                # Update wallet address
-                if segment_result.simulation_data.get("wallet_address"):
-                    wallet_address = segment_result.simulation_data["wallet_address"]
+                if on_segment:
+                    on_segment(segment_result)
+                exec_data["total_fees"] += segment_result.fees_paid
+                exec_data["confirmation_minutes_total"] += segment_result.confirmation_time_minutes or 0
                 
                 # Update amount (use max output for parallel segments)
                 if segment_result.output_amount > current_amount:
                     current_amount = segment_result.output_amount
+                    exec_data["current_amount"] = current_amount
             
-            self.active_executions[execution_id]["segment_executions"] = segment_executions
-            self.active_executions[execution_id]["current_segment"] = group[-1][0] + 1
+            # Keep the group's results in route order; the last wallet in that order carries forward
+            segment_executions[group_start:] = sorted(
+                segment_executions[group_start:], key=lambda seg: seg.segment_index
+            )
+            for segment_result in segment_executions[group_start:]:
+                if segment_result.simulation_data.get("wallet_address"):
+                    wallet_address = segment_result.simulation_data["wallet_address"]
+            
+            exec_data["current_segment"] = group[-1][0] + 1
         
         return await self._build_response(execution_id, route_segments, segment_executions, request.amount, current_amount, request)
     
@@ -305,7 +523,7 @@ class AdvancedExecutionService:
             seg_type = segment.get("segment_type")
             
             # Segments that can run in parallel (independent operations)
-            if seg_type in ["fx", "crypto"] and len(current_group) < 3:
+            if seg_type in _PARALLELIZABLE_TYPES and len(current_group) < 3:
                 current_group.append((idx, segment))
             else:
                 if current_group:
@@ -317,6 +535,12 @@ class AdvancedExecutionService:
         
         return groups
     
+    @staticmethod
+    def _segment_type(value: Any) -> SegmentType:
+        """SegmentType for a route dict value; unknown values still raise ValueError"""
+        segment_type = _SEGMENT_TYPES.get(value)
+        return segment_type if segment_type is not None else SegmentType(value)
+    
     async def _execute_segment(
         self,
         execution_id: str,
@@ -327,8 +551,10 @@ class AdvancedExecutionService:
     ) -> SegmentExecutionResult:
         """Execute a single segment"""
         try:
-            segment = RouteSegment(
-                segment_type=SegmentType(segment_dict.get("segment_type", "")),
+            # Route dicts come from the routing service (already-validated segments);
+            # construct without re-running pydantic validation per segment
+            segment = RouteSegment.model_construct(
+                segment_type=self._segment_type(segment_dict.get("segment_type", "")),
                 from_asset=segment_dict.get("from_asset", ""),
                 to_asset=segment_dict.get("to_asset", ""),
                 from_network=segment_dict.get("from_network"),
@@ -385,6 +611,49 @@ class AdvancedExecutionService:
                 error_message=str(e)
             )
     
+    @staticmethod
+    def _segment_drift(segment_dict: Dict[str, Any], result: SegmentExecutionResult) -> Tuple[float, float]:
+        """
+        Relative (cost, latency) overrun of an executed segment against the
+        route's estimate for it; 0.0 where there is no estimate to compare with.
+        """
+        cost = segment_dict.get("cost", {})
+        expected_fees = result.input_amount * cost.get("fee_percent", 0.0) / 100 + cost.get("fixed_fee", 0.0)
+        cost_drift = (result.fees_paid - expected_fees) / expected_fees if expected_fees > 0 else 0.0
+        
+        latency = segment_dict.get("latency", {})
+        expected_minutes = (latency.get("min_minutes", 0) + latency.get("max_minutes", 0)) / 2
+        actual_minutes = result.confirmation_time_minutes
+        if actual_minutes is None or expected_minutes <= 0:
+            latency_drift = 0.0
+        else:
+            latency_drift = (actual_minutes - expected_minutes) / expected_minutes
+        return cost_drift, latency_drift
+    
+    def _drift_exceeds_thresholds(self, exec_data: Dict[str, Any]) -> bool:
+        """Whether the last segment came in over its cost or latency estimate by more than the re-route thresholds"""
+        cost_drift, latency_drift = exec_data.get("last_segment_drift", (0.0, 0.0))
+        return (
+            cost_drift * 100 > self.reroute_thresholds["cost_increase_percent"] or
+            latency_drift * 100 > self.reroute_thresholds["latency_increase_percent"]
+        )
+    
+    async def _prefetch_route(self, next_segment: Dict[str, Any], request: RouteExecutionRequest):
+        """
+        Populate the route cache for the leg _should_reroute would look up from
+        next_segment (no DB fallback), so the probe after a segment is a cache hit.
+        """
+        try:
+            await self._cached_find_route(
+                next_segment.get("from_asset"),
+                request.to_asset,
+                next_segment.get("from_network"),
+                request.to_network,
+                use_db_fallback=False
+            )
+        except Exception as e:
+            logger.debug(f"Route prefetch failed: {e}")
+    
     async def _should_reroute(
         self,
         execution_id: str,
@@ -395,12 +664,17 @@ class AdvancedExecutionService:
         """AI-based decision: should we re-route?"""
         try:
             # Get current route metrics
-            current_route = self.active_executions[execution_id]["route"]
-            completed_segments = self.active_executions[execution_id]["segment_executions"]
+            exec_data = self.active_executions[execution_id]
+            
+            # Cheap precheck: only search for an alternative once the last segment
+            # came in materially over its cost or latency estimate
+            if not self._drift_exceeds_thresholds(exec_data):
+                return False
+            
+            current_route = exec_data["route"]
             
-            # Calculate current route cost/latency
-            total_cost = sum(seg.fees_paid for seg in completed_segments)
-            total_latency = sum(seg.confirmation_time_minutes or 0 for seg in completed_segments)
+            # Latency of completed segments, kept as a running total by _execute_sequential
+            total_latency = exec_data["confirmation_minutes_total"]
             
             # Get new optimal route from current position
             remaining_segments = current_route[current_segment:]
@@ -408,27 +682,19 @@ class AdvancedExecutionService:
                 return False
             
             # Calculate what remaining route should cost
-            remaining_cost_estimate = sum(
-                seg.get("cost", {}).get("fee_percent", 0) * current_amount / 100
-                for seg in remaining_segments
-            )
+            remaining_cost_estimate = self._remaining_fee_percent(exec_data, current_segment) * current_amount / 100
             
-            # Get alternative route
-            segments = await self.aggregator_service.get_cached_segments()
-            if not segments:
-                return False
-            
-            # Find route from current asset to destination
+            # Find alternative route from current asset to destination
             current_asset = remaining_segments[0].get("from_asset") if remaining_segments else request.to_asset
-            alt_route = self.routing_service.find_optimal_route(
-                segments=segments,
-                from_asset=current_asset,
-                to_asset=request.to_asset,
-                from_network=remaining_segments[0].get("from_network") if remaining_segments else None,
-                to_network=request.to_network
+            alt_route = await self._cached_find_route(
+                current_asset,
+                request.to_asset,
+                remaining_segments[0].get("from_network") if remaining_segments else None,
+                request.to_network,
+                use_db_fallback=False
             )
             
-            if "error" in alt_route:
+            if alt_route is None or "error" in alt_route:
                 return False
             
             # Compare routes
@@ -436,13 +702,15 @@ class AdvancedExecutionService:
             alt_latency = alt_route.get("eta_hours", 0) * 60
             
             # Decision logic
-            cost_increase = ((alt_cost - remaining_cost_estimate) / remaining_cost_estimate * 100) if remaining_cost_estimate > 0 else 0
-            latency_increase = ((alt_latency - total_latency) / total_latency * 100) if total_latency > 0 else 0
-            
-            should_reroute = (
-                cost_increase < -self.reroute_thresholds["cost_increase_percent"] or  # Better cost
-                latency_increase < -self.reroute_thresholds["latency_increase_percent"] or  # Better latency
-                alt_route.get("reliability", 0) > 0.9  # High reliability alternative
+            should_reroute = _reroute_decision(
+                alt_cost,
+                remaining_cost_estimate,
+                alt_latency,
+                total_latency,
+                alt_route.get("reliability", 0),
+                self.reroute_thresholds["cost_increase_percent"],
+                self.reroute_thresholds["latency_increase_percent"],
+                0.9
             )
             
             return should_reroute
@@ -451,6 +719,22 @@ class AdvancedExecutionService:
             logger.error(f"Error in AI re-routing decision: {e}")
             return False
     
+    @staticmethod
+    def _remaining_fee_percent(exec_data: Dict[str, Any], start: int) -> float:
+        """
+        Sum of fee_percent over route[start:], from suffix sums built once per
+        route list (rebuilt when the execution is re-routed).
+        """
+        route = exec_data["route"]
+        cached = exec_data.get("fee_percent_suffix")
+        if cached is None or cached[0] is not route:
+            fee_percents = [seg.get("cost", {}).get("fee_percent", 0) for seg in route]
+            suffix = list(itertools.accumulate(reversed(fee_percents)))[::-1] + [0]
+            cached = (route, suffix)
+            exec_data["fee_percent_suffix"] = cached
+        suffix = cached[1]
+        return suffix[start] if start < len(suffix) else 0
+    
     async def _calculate_reroute(
         self,
         execution_id: str,
@@ -471,39 +755,43 @@ class AdvancedExecutionService:
             current_network = remaining_segments[0].get("from_network")
             
             # Get new route
-            segments = await self.aggregator_service.get_cached_segments()
-            if not segments:
-                segments = await self.aggregator_service.get_segments_from_db(limit=1000)
-            
-            if not segments:
-                return None
-            
-            new_route_result = self.routing_service.find_optimal_route(
-                segments=segments,
-                from_asset=current_asset,
-                to_asset=request.to_asset,
-                from_network=current_network,
-                to_network=request.to_network
+            new_route_result = await self._cached_find_route(
+                current_asset, request.to_asset, current_network, request.to_network
             )
             
-            if "error" in new_route_result:
+            if new_route_result is None or "error" in new_route_result:
                 return None
             
-            # Combine completed segments with new route
-            completed = self.active_executions[execution_id]["segment_executions"]
-            new_route = new_route_result.get("route", [])
+            # Combine completed segments with new route, so segment indices stay valid
+            new_route = current_route[:current_segment] + new_route_result.get("route", [])
             
-            # Update execution state
+            # Update execution state; _install_route clears it once the route is in place
             self.execution_states[execution_id] = ExecutionState.REROUTING
             self.active_executions[execution_id]["status"] = ExecutionStatus.REROUTING
+            event = self.reroute_events.get(execution_id)
+            if event is not None:
+                event.clear()
             
-            # Return new route starting from current position
             return new_route
             
         except Exception as e:
             logger.error(f"Error calculating re-route: {e}")
             return None
     
+    def _install_route(self, execution_id: str, new_route: List[Dict[str, Any]]):
+        """Swap in a re-routed route and release anything waiting on the re-route"""
+        exec_data = self.active_executions[execution_id]
+        exec_data["route"] = new_route
+        exec_data.pop("parallel_groups", None)
+        exec_data["total_segments"] = len(new_route)
+        # Leave a pause/cancel that arrived meanwhile in place
+        if self.execution_states.get(execution_id) == ExecutionState.REROUTING:
+            self.execution_states[execution_id] = ExecutionState.RUNNING
+            exec_data["status"] = ExecutionStatus.IN_PROGRESS
+        event = self.reroute_events.get(execution_id)
+        if event is not None:
+            event.set()
+    
     async def pause_execution(self, execution_id: str) -> bool:
         """Pause an execution"""
         if execution_id not in self.active_executions:
@@ -512,6 +800,7 @@ class AdvancedExecutionService:
         async with self.execution_locks[execution_id]:
             self.execution_states[execution_id] = ExecutionState.PAUSED
             self.active_executions[execution_id]["status"] = ExecutionStatus.PAUSED
+            self._set_resume_event(execution_id, False)
             logger.info(f"Execution {execution_id} paused")
         
         return True
@@ -527,14 +816,26 @@ class AdvancedExecutionService:
             
             self.execution_states[execution_id] = ExecutionState.RUNNING
             self.active_executions[execution_id]["status"] = ExecutionStatus.IN_PROGRESS
+            self._set_resume_event(execution_id, True)
             logger.info(f"Execution {execution_id} resumed")
         
         return True
     
+    def _set_resume_event(self, execution_id: str, running: bool):
+        """Set (running) or clear (paused) the execution's resume event, if it is still live"""
+        event = self.resume_events.get(execution_id)
+        if event is None:
+            return
+        if running:
+            event.set()
+        else:
+            event.clear()
+    
     async def _wait_for_resume(self, execution_id: str):
-        """Wait for execution to be resumed"""
-        while self.execution_states.get(execution_id) == ExecutionState.PAUSED:
-            await asyncio.sleep(0.5)
+        """Wait for execution to be resumed (or cancelled)"""
+        event = self.resume_events.get(execution_id)
+        if event is not None:
+            await event.wait()
     
     async def cancel_execution(self, request: CancelExecutionRequest) -> Dict[str, Any]:
         """Cancel an execution"""
@@ -546,26 +847,30 @@ class AdvancedExecutionService:
         async with self.execution_locks[execution_id]:
             self.execution_states[execution_id] = ExecutionState.CANCELLING
             self.active_executions[execution_id]["status"] = ExecutionStatus.CANCELLED
+            # Wake a paused execution so it can observe the cancellation
+            self._set_resume_event(execution_id, True)
         
-        # Cancel pending transactions
+        # Cancel pending transactions, concurrently (bounded per provider round-trip)
         cancelled_count = 0
         if request.cancel_pending_segments:
             tx_ids = self.transaction_ids.get(execution_id, {})
-            for seg_idx, tx_info in tx_ids.items():
+            semaphore = asyncio.Semaphore(_CANCEL_CONCURRENCY)
+            
+            async def cancel_one(tx_info: Dict[str, Any]) -> bool:
+                provider = tx_info.get("provider")
+                tx_id = tx_info.get("tx_id")
                 try:
-                    provider = tx_info.get("provider")
-                    tx_id = tx_info.get("tx_id")
-                    
-                    if provider == "wise" and self.wise_client:
-                        result = await self.wise_client.cancel_transfer(tx_id)
-                        if result:
-                            cancelled_count += 1
-                    elif provider == "kraken" and self.kraken_client:
-                        result = await self.kraken_client.cancel_order(tx_id)
-                        if result:
-                            cancelled_count += 1
+                    async with semaphore:
+                        if provider == "wise" and self.wise_client:
+                            return bool(await self.wise_client.cancel_transfer(tx_id))
+                        elif provider == "kraken" and self.kraken_client:
+                            return bool(await self.kraken_client.cancel_order(tx_id))
                 except Exception as e:
                     logger.error(f"Error cancelling transaction {tx_id}: {e}")
+                return False
+            
+            results = await asyncio.gather(*(cancel_one(tx_info) for tx_info in list(tx_ids.values())))
+            cancelled_count = sum(results)
         
         return {
             "execution_id": execution_id,
@@ -585,7 +890,7 @@ class AdvancedExecutionService:
             status=ExecutionStatus.CANCELLED,
             route=self.active_executions[execution_id].get("route", []),
             total_cost_percent=0.0,
-            total_fees=sum(seg.fees_paid for seg in segment_executions),
+            total_fees=self.active_executions[execution_id]["total_fees"],
             input_amount=original_amount,
             final_amount=segment_executions[-1].output_amount if segment_executions else original_amount,
             eta_hours=0.0,
@@ -620,16 +925,12 @@ class AdvancedExecutionService:
             )
             
             if new_route:
-                exec_data["route"] = new_route
-                exec_data["total_segments"] = len(new_route)
-                self.execution_states[execution_id] = ExecutionState.RUNNING
+                self._install_route(execution_id, new_route)
                 return {"status": "rerouted", "new_route": new_route}
         else:
             # Use provided route
             if request.new_route:
-                exec_data["route"] = request.new_route
-                exec_data["total_segments"] = len(request.new_route)
-                self.execution_states[execution_id] = ExecutionState.RUNNING
+                self._install_route(execution_id, request.new_route)
                 return {"status": "rerouted", "new_route": request.new_route}
         
         return {"error": "Failed to reroute"}
@@ -682,8 +983,9 @@ class AdvancedExecutionService:
         request: RouteExecutionRequest
     ) -> RouteExecutionResponse:
         """Build execution response"""
-        total_fees = sum(seg.fees_paid for seg in segment_executions)
-        total_time = sum(seg.confirmation_time_minutes or 0 for seg in segment_executions)
+        exec_data = self.active_executions[execution_id]
+        total_fees = exec_data["total_fees"]
+        total_time = exec_data["confirmation_minutes_total"]
         
         status = ExecutionStatus.COMPLETED
         if any(seg.status == SegmentExecutionStatus.FAILED for seg in segment_executions):
@@ -691,8 +993,6 @@ class AdvancedExecutionService:
         elif self.execution_states.get(execution_id) == ExecutionState.CANCELLING:
             status = ExecutionStatus.CANCELLED
         
-        exec_data = self.active_executions[execution_id]
-        
         return RouteExecutionResponse(
             execution_id=execution_id,
             status=status,
@@ -3,8 +3,11 @@ Execution Service - Orchestrates route execution
 Coordinates segment executors and manages execution flow
 """
 import uuid
+import asyncio
+import itertools
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Union
+import httpx
 from datetime import datetime
 
 from app.schemas.route_segment import RouteSegment, SegmentType
@@ -27,8 +30,8 @@ from app.services.execution.advanced_execution_service import AdvancedExecutionS
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
 from app.clients import WiseClient, KrakenClient
+from app.infra.http_client import get_http_client
 from app.config import settings
-import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -36,14 +39,19 @@ logger = logging.getLogger(__name__)
 class ExecutionService:
     """Main execution service that orchestrates route execution"""
     
-    def __init__(self, routing_service: RoutingService, aggregator_service: AggregatorService):
+    def __init__(
+        self,
+        routing_service: RoutingService,
+        aggregator_service: AggregatorService,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.routing_service = routing_service
         self.aggregator_service = aggregator_service
         self.simulator = Simulator()
         self.execution_mode = settings.execution_mode
         
-        # Initialize API clients for real execution
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Initialize API clients for real execution (app-owned shared client unless injected)
+        self.http_client = http_client or get_http_client()
         self.wise_client = WiseClient(self.http_client) if settings.wise_api_key else None
         self.kraken_client = KrakenClient(self.http_client) if settings.kraken_api_key else None
         
@@ -56,13 +64,32 @@ class ExecutionService:
             SegmentType.OFF_RAMP: RampExecutor(self.simulator),
             SegmentType.BANK_RAIL: BankRailExecutor(self.simulator, wise_client=self.wise_client),
         }
+        # Executors are fixed for the service's lifetime; bind their execute methods once
+        self._executor_exec = {
+            segment_type: executor.execute for segment_type, executor in self.executors.items()
+        }
         
         # Initialize advanced execution service for new features
-        self.advanced_service = AdvancedExecutionService(routing_service, aggregator_service)
+        self.advanced_service = AdvancedExecutionService(routing_service, aggregator_service, self.http_client)
         
         # Store active executions (in-memory for MVP)
         self.active_executions: Dict[str, Dict[str, Any]] = {}
         self.max_execution_history = 1000  # Limit memory usage
+        
+        # Strong references to streamed executions that may outlive their consumer
+        self._background_tasks: Set[asyncio.Task] = set()
+    
+    @staticmethod
+    def validate_request(request: RouteExecutionRequest):
+        """Input validation shared by every execute entry point"""
+        if not request.from_asset or not request.to_asset:
+            raise ValueError("from_asset and to_asset are required")
+        
+        if request.amount <= 0:
+            raise ValueError("Amount must be greater than 0")
+        
+        if request.amount > 1e15:  # Sanity check for extremely large amounts
+            raise ValueError("Amount exceeds maximum limit")
     
     async def execute_route(
         self,
@@ -79,18 +106,7 @@ class ExecutionService:
         3. Track execution status
         4. Return execution results
         """
-        execution_id = str(uuid.uuid4())
-        started_at = datetime.utcnow()
-        
-        # Input validation
-        if not request.from_asset or not request.to_asset:
-            raise ValueError("from_asset and to_asset are required")
-        
-        if request.amount <= 0:
-            raise ValueError("Amount must be greater than 0")
-        
-        if request.amount > 1e15:  # Sanity check for extremely large amounts
-            raise ValueError("Amount exceeds maximum limit")
+        self.validate_request(request)
         
         # Use advanced service for new features
         return await self.advanced_service.execute_route(request, parallel=parallel, enable_ai_rerouting=enable_ai_rerouting)
@@ -103,37 +119,24 @@ class ExecutionService:
         execution_id = str(uuid.uuid4())
         started_at = datetime.utcnow()
         
-        # Input validation
-        if not request.from_asset or not request.to_asset:
-            raise ValueError("from_asset and to_asset are required")
-        
-        if request.amount <= 0:
-            raise ValueError("Amount must be greater than 0")
-        
-        if request.amount > 1e15:  # Sanity check for extremely large amounts
-            raise ValueError("Amount exceeds maximum limit")
+        self.validate_request(request)
         
         try:
             # Step 1: Get route
             logger.info(f"Execution {execution_id}: Getting optimal route...")
             
-            # Get route segments
-            segments = await self.aggregator_service.get_cached_segments()
-            if not segments:
-                segments = await self.aggregator_service.get_segments_from_db(limit=1000)
+            # Get optimal route, through the advanced service's TTL'd route cache
+            # (shared with execute_route, keyed on assets, networks and segments version)
+            route_result = await self.advanced_service._cached_find_route(
+                request.from_asset,
+                request.to_asset,
+                request.from_network,
+                request.to_network
+            )
             
-            if not segments:
+            if route_result is None:
                 raise ValueError("No route segments available")
             
-            # Get optimal route
-            route_result = self.routing_service.find_optimal_route(
-                segments=segments,
-                from_asset=request.from_asset,
-                to_asset=request.to_asset,
-                from_network=request.from_network,
-                to_network=request.to_network
-            )
-            
             if "error" in route_result:
                 raise ValueError(route_result["error"])
             
@@ -146,7 +149,8 @@ class ExecutionService:
             # Step 2: Execute segments sequentially
             segment_executions: List[SegmentExecutionResult] = []
             current_amount = request.amount
-            wallet_address: Optional[str] = None
+            total_fees = 0.0
+            total_time_minutes = 0
             
             # Store execution state
             self.active_executions[execution_id] = {
@@ -159,46 +163,17 @@ class ExecutionService:
             
             # Cleanup old executions if too many
             if len(self.active_executions) > self.max_execution_history:
-                # Remove oldest completed/failed executions
-                sorted_executions = sorted(
-                    self.active_executions.items(),
-                    key=lambda x: x[1].get("started_at", datetime.utcnow())
-                )
-                for old_id, _ in sorted_executions[:len(self.active_executions) - self.max_execution_history + 100]:
-                    if self.active_executions[old_id].get("status") in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED]:
-                        del self.active_executions[old_id]
+                self._evict_finished()
             
+            # Convert every segment up front, so an invalid one fails the execution
+            # before any segment has run
+            segments_parsed: List[RouteSegment] = []
             for idx, segment_dict in enumerate(route_segments):
-                logger.info(f"Execution {execution_id}: Executing segment {idx + 1}/{len(route_segments)}")
-                
-                # Update active execution
-                self.active_executions[execution_id]["current_segment"] = idx
-                
-                # Convert dict to RouteSegment with validation
                 try:
-                    segment_type_str = segment_dict.get("segment_type")
-                    if not segment_type_str:
-                        raise ValueError(f"Segment {idx} missing segment_type")
-                    
-                    segment = RouteSegment(
-                        segment_type=SegmentType(segment_type_str),
-                        from_asset=segment_dict.get("from_asset", ""),
-                        to_asset=segment_dict.get("to_asset", ""),
-                        from_network=segment_dict.get("from_network"),
-                        to_network=segment_dict.get("to_network"),
-                        cost=segment_dict.get("cost", {}),
-                        latency=segment_dict.get("latency", {}),
-                        reliability_score=segment_dict.get("reliability_score", 1.0),
-                        provider=segment_dict.get("provider")
-                    )
-                    
-                    # Validate segment has required fields
-                    if not segment.from_asset or not segment.to_asset:
-                        raise ValueError(f"Segment {idx} missing from_asset or to_asset")
-                        
+                    segments_parsed.append(self._parse_segment(idx, segment_dict))
                 except (KeyError, ValueError, TypeError) as e:
                     logger.error(f"Execution {execution_id}: Invalid segment {idx}: {e}")
-                    segment_result = SegmentExecutionResult(
+                    segment_executions.append(SegmentExecutionResult(
                         segment_index=idx,
                         segment_type=segment_dict.get("segment_type", "unknown"),
                         from_asset=segment_dict.get("from_asset", ""),
@@ -208,41 +183,27 @@ class ExecutionService:
                         output_amount=0.0,
                         fees_paid=0.0,
                         error_message=f"Invalid segment data: {str(e)}"
-                    )
-                    segment_executions.append(segment_result)
+                    ))
                     self.active_executions[execution_id]["status"] = ExecutionStatus.FAILED
                     break
-                
-                # Get executor for segment type
-                executor = self.executors.get(segment.segment_type)
-                if not executor:
-                    logger.warning(f"No executor for segment type: {segment.segment_type}")
-                    segment_result = SegmentExecutionResult(
-                        segment_index=idx,
-                        segment_type=segment.segment_type.value,
-                        from_asset=segment.from_asset,
-                        to_asset=segment.to_asset,
-                        status=SegmentExecutionStatus.SKIPPED,
-                        input_amount=current_amount,
-                        output_amount=current_amount,
-                        fees_paid=0.0,
-                        error_message=f"No executor for segment type: {segment.segment_type}"
-                    )
-                else:
-                    # Execute segment
-                    segment_result = await executor.execute(
-                        segment=segment,
-                        input_amount=current_amount,
-                        wallet_address=wallet_address,
-                        metadata={"segment_index": idx, "execution_id": execution_id}
-                    )
-                    
-                    # Update wallet address if generated
-                    if segment_result.simulation_data.get("wallet_address"):
-                        wallet_address = segment_result.simulation_data["wallet_address"]
+            
+            # Nothing runs if validation already failed
+            if segment_executions:
+                segments_parsed = []
+            
+            # A route from find_optimal_route is a chain (each leg consumes the
+            # previous leg's output), so segments run strictly in order
+            wallet_address: Optional[str] = None
+            for idx, segment in enumerate(segments_parsed):
+                self.active_executions[execution_id]["current_segment"] = idx
+                segment_result = await self._execute_legacy_segment(
+                    execution_id, idx, segment, current_amount, wallet_address
+                )
                 
                 segment_executions.append(segment_result)
                 self.active_executions[execution_id]["segment_executions"] = segment_executions
+                total_fees += segment_result.fees_paid
+                total_time_minutes += segment_result.confirmation_time_minutes or 0
                 
                 # Check if segment failed
                 if segment_result.status == SegmentExecutionStatus.FAILED:
@@ -250,22 +211,20 @@ class ExecutionService:
                     self.active_executions[execution_id]["status"] = ExecutionStatus.FAILED
                     break
                 
+                # Update wallet address if generated
+                if segment_result.simulation_data.get("wallet_address"):
+                    wallet_address = segment_result.simulation_data["wallet_address"]
+                
                 # Update current amount for next segment
                 current_amount = segment_result.output_amount
                 logger.info(f"Execution {execution_id}: Segment {idx + 1} completed. "
                            f"Amount: {segment_result.input_amount} -> {segment_result.output_amount}")
             
-            # Step 3: Calculate totals
-            total_fees = sum(seg.fees_paid for seg in segment_executions)
-            total_time_minutes = sum(
-                seg.confirmation_time_minutes or 0 
-                for seg in segment_executions 
-                if seg.confirmation_time_minutes
-            )
+            # Step 3: Totals were accumulated per segment above
             completed_at = datetime.utcnow()
             
-            # Determine final status
-            if any(seg.status == SegmentExecutionStatus.FAILED for seg in segment_executions):
+            # Determine final status (any failed segment already flagged the execution)
+            if self.active_executions[execution_id]["status"] == ExecutionStatus.FAILED:
                 final_status = ExecutionStatus.FAILED
             else:
                 final_status = ExecutionStatus.COMPLETED
@@ -310,6 +269,136 @@ class ExecutionService:
                 error_message=str(e)
             )
     
+    def _evict_finished(self):
+        """
+        Drop the oldest completed/failed executions until the history is back at
+        max_execution_history. Executions are inserted as they start, so dict
+        order is already oldest-first; no sort by started_at needed.
+        """
+        excess = len(self.active_executions) - self.max_execution_history
+        evicted = list(itertools.islice(
+            (
+                execution_id for execution_id, exec_data in self.active_executions.items()
+                if exec_data.get("status") in (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED)
+            ),
+            max(excess, 0)
+        ))
+        for execution_id in evicted:
+            del self.active_executions[execution_id]
+    
+    @staticmethod
+    def _parse_segment(idx: int, segment_dict: Dict[str, Any]) -> RouteSegment:
+        """Convert a route dict to a RouteSegment with validation"""
+        segment_type_str = segment_dict.get("segment_type")
+        if not segment_type_str:
+            raise ValueError(f"Segment {idx} missing segment_type")
+        
+        segment = RouteSegment(
+            # Dict lookup shared with the advanced service; unknown types raise ValueError
+            segment_type=AdvancedExecutionService._segment_type(segment_type_str),
+            from_asset=segment_dict.get("from_asset", ""),
+            to_asset=segment_dict.get("to_asset", ""),
+            from_network=segment_dict.get("from_network"),
+            to_network=segment_dict.get("to_network"),
+            cost=segment_dict.get("cost", {}),
+            latency=segment_dict.get("latency", {}),
+            reliability_score=segment_dict.get("reliability_score", 1.0),
+            provider=segment_dict.get("provider")
+        )
+        
+        # Validate segment has required fields
+        if not segment.from_asset or not segment.to_asset:
+            raise ValueError(f"Segment {idx} missing from_asset or to_asset")
+        return segment
+    
+    async def _execute_legacy_segment(
+        self,
+        execution_id: str,
+        idx: int,
+        segment: RouteSegment,
+        input_amount: float,
+        wallet_address: Optional[str]
+    ) -> SegmentExecutionResult:
+        """Execute one (already validated) segment of execute_route_legacy"""
+        logger.info(f"Execution {execution_id}: Executing segment {idx + 1}")
+        
+        # Get executor for segment type
+        execute = self._executor_exec.get(segment.segment_type)
+        if execute is None:
+            logger.warning(f"No executor for segment type: {segment.segment_type}")
+            return SegmentExecutionResult(
+                segment_index=idx,
+                segment_type=segment.segment_type.value,
+                from_asset=segment.from_asset,
+                to_asset=segment.to_asset,
+                status=SegmentExecutionStatus.SKIPPED,
+                input_amount=input_amount,
+                output_amount=input_amount,
+                fees_paid=0.0,
+                error_message=f"No executor for segment type: {segment.segment_type}"
+            )
+        
+        # Execute segment
+        return await execute(
+            segment=segment,
+            input_amount=input_amount,
+            wallet_address=wallet_address,
+            metadata={"segment_index": idx, "execution_id": execution_id}
+        )
+    
+    async def execute_route_iter(
+        self,
+        request: RouteExecutionRequest,
+        parallel: bool = False,
+        enable_ai_rerouting: bool = True,
+        validated: bool = False
+    ) -> AsyncIterator[Union[SegmentExecutionResult, RouteExecutionResponse]]:
+        """
+        Execute a route, yielding each SegmentExecutionResult as it completes
+        and the final RouteExecutionResponse last.
+        
+        The execution runs in its own task: if the consumer stops early (e.g. a
+        streaming client disconnects) the route still runs to completion.
+        Pass validated=True if the caller already ran validate_request.
+        """
+        if not validated:
+            self.validate_request(request)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self.advanced_service.execute_route(
+                request,
+                parallel=parallel,
+                enable_ai_rerouting=enable_ai_rerouting,
+                on_segment=queue.put_nowait
+            )
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+        
+        next_segment = None
+        try:
+            while not task.done():
+                next_segment = asyncio.ensure_future(queue.get())
+                await asyncio.wait({next_segment, task}, return_when=asyncio.FIRST_COMPLETED)
+                if next_segment.done():
+                    yield next_segment.result()
+                else:
+                    next_segment.cancel()
+        finally:
+            if next_segment is not None and not next_segment.done():
+                next_segment.cancel()
+        
+        while not queue.empty():
+            yield queue.get_nowait()
+        yield task.result()
+    
+    def _on_background_task_done(self, task: asyncio.Task):
+        """Drop a finished streamed execution and surface a failure nobody awaited"""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Streamed execution failed: {task.exception()}")
+    
     def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
         """Get status of an active execution"""
         return self.advanced_service.get_execution_status(execution_id) or self.active_executions.get(execution_id)
@@ -55,11 +55,10 @@ class FXExecutor(SegmentExecutor):
             # Real execution via Wise API
             if self.execution_mode == "real" and self.wise_client and segment.provider == "wise":
                 try:
-                    # Get profile ID (cache this in production)
-                    profiles = await self.wise_client.get_profiles()
-                    if not profiles:
+                    # Get profile ID (cached by the client)
+                    profile_id = await self.wise_client._get_profile_id()
+                    if not profile_id:
                         raise ValueError("No Wise profiles found")
-                    profile_id = profiles[0]["id"]
                     
                     # Create quote
                     quote = await self.wise_client.create_quote(
@@ -665,11 +664,10 @@ class BankRailExecutor(SegmentExecutor):
                     # Get target account details from metadata or use defaults
                     target_account = metadata.get("target_account", {}) if metadata else {}
                     
-                    # Get profile ID
-                    profiles = await self.wise_client.get_profiles()
-                    if not profiles:
+                    # Get profile ID (cached by the client)
+                    profile_id = await self.wise_client._get_profile_id()
+                    if not profile_id:
                         raise ValueError("No Wise profiles found")
-                    profile_id = profiles[0]["id"]
                     
                     # Execute transfer via Wise
                     transfer_result = await self.wise_client.execute_bank_transfer(
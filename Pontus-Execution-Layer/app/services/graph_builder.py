@@ -2,8 +2,11 @@
 Graph Builder Service
 Converts route segments into a graph structure for optimization solvers.
 """
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Callable, Dict, List, Set, Tuple, Optional
 from collections import defaultdict
+
+import numpy as np
+
 from app.schemas.route_segment import RouteSegment, SegmentType
 
 
@@ -17,10 +20,19 @@ class RouteGraph:
         self.nodes: Set[str] = set()
         # Segment metadata
         self.segments: List[RouteSegment] = []
+        # id(segment) -> row in the feature matrix (same order as self.segments)
+        self._segment_rows: Dict[int, int] = {}
+        self._features: Optional[np.ndarray] = None
+        # Bumped on every mutation; invalidates the cached solver views
+        self._revision = 0
+        self._cached_mip_view: Optional[Tuple[tuple, tuple]] = None
     
     def add_segment(self, segment: RouteSegment):
         """Add a route segment to the graph"""
+        self._segment_rows[id(segment)] = len(self.segments)
         self.segments.append(segment)
+        self._features = None
+        self._revision += 1
         
         # Create node identifiers
         # For FX and bank_rail: just use asset
@@ -44,6 +56,91 @@ class RouteGraph:
         """Get all segments between two nodes"""
         return self.graph.get(from_node, {}).get(to_node, [])
     
+    def get_mip_view(
+        self,
+        edge_cost: Callable[[RouteSegment], float],
+        weights: Tuple[float, float, float]
+    ) -> Tuple[List[str], Dict[str, int], List[Tuple[int, int, float]], List[RouteSegment]]:
+        """
+        Indexed view of the graph for the MIP/shortest-path solvers:
+        (nodes, node_to_index, edges, edge_to_segment), where each edge is
+        (from_idx, to_idx, cost) for the cheapest segment between two nodes and
+        edge_to_segment[i] is the segment behind edges[i].
+        
+        Rebuilt only when the graph changes or a different weight set is used.
+        """
+        key = (self._revision, weights)
+        if self._cached_mip_view is not None and self._cached_mip_view[0] == key:
+            return self._cached_mip_view[1]
+        
+        nodes = list(self.nodes)
+        node_to_index = {node: i for i, node in enumerate(nodes)}
+        edges = []
+        edge_to_segment: List[RouteSegment] = []
+        
+        for from_node, neighbors in self.graph.items():
+            from_idx = node_to_index[from_node]
+            
+            for to_node, segments_list in neighbors.items():
+                to_idx = node_to_index[to_node]
+                
+                # Find best segment
+                best_segment = None
+                best_cost = float('inf')
+                
+                for segment in segments_list:
+                    cost = edge_cost(segment)
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_segment = segment
+                
+                if best_segment:
+                    edges.append((from_idx, to_idx, best_cost))
+                    edge_to_segment.append(best_segment)
+        
+        view = (nodes, node_to_index, edges, edge_to_segment)
+        self._cached_mip_view = (key, view)
+        return view
+    
+    def segment_features(self) -> np.ndarray:
+        """
+        (N_segments, 5) float matrix, built once per graph:
+        fee_percent, fixed_fee, min_latency, max_latency, reliability.
+        """
+        if self._features is None:
+            self._features = np.array(
+                [
+                    (s.fee_percent, s.fixed_fee, s.min_minutes, s.max_minutes, s.reliability_score)
+                    for s in self.segments
+                ],
+                dtype=np.float64
+            ).reshape(-1, 5)
+        return self._features
+    
+    def path_feature_totals(self, paths: List[List[RouteSegment]]) -> np.ndarray:
+        """
+        Per-path totals of the segment features in one reduction over all paths.
+        
+        Returns an (N_paths, 5) matrix: summed fee_percent, fixed_fee, min_latency
+        and max_latency, plus mean reliability (0.0 for an empty path).
+        """
+        totals = np.zeros((len(paths), 5), dtype=np.float64)
+        lengths = np.fromiter((len(p) for p in paths), dtype=np.intp, count=len(paths))
+        nonempty = lengths > 0
+        if not nonempty.any():
+            return totals
+        
+        rows = np.fromiter(
+            (self._segment_rows[id(s)] for p in paths for s in p),
+            dtype=np.intp,
+            count=int(lengths.sum())
+        )
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        sums = np.add.reduceat(self.segment_features()[rows], starts, axis=0)
+        sums[:, 4] /= lengths[nonempty]
+        totals[nonempty] = sums
+        return totals
+    
     def find_paths(
         self,
         from_asset: str,
@@ -6,6 +6,8 @@ from typing import List, Dict, Optional, Tuple
 import math
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Try to import OR-Tools graph module (may not be available in all versions)
@@ -25,6 +27,7 @@ except ImportError:
 
 from app.schemas.route_segment import RouteSegment
 from app.services.graph_builder import RouteGraph
+from app.services.argmax_decision import top_k_order
 
 
 class ORToolsSolver:
@@ -172,29 +175,34 @@ class ORToolsSolver:
         if not all_paths:
             return []
         
-        # Calculate metrics for each path
-        path_metrics = []
-        for path in all_paths:
-            metrics = self._calculate_path_metrics(path)
-            path_metrics.append((path, metrics))
-        
-        # Sort by different objectives and return top paths
-        # 1. Cost-optimized
-        cost_sorted = sorted(path_metrics, key=lambda x: x[1]['total_cost'])
-        # 2. Latency-optimized
-        latency_sorted = sorted(path_metrics, key=lambda x: x[1]['total_latency'])
-        # 3. Reliability-optimized
-        reliability_sorted = sorted(path_metrics, key=lambda x: -x[1]['reliability'])
-        # 4. Combined score
-        combined_sorted = sorted(path_metrics, key=lambda x: x[1]['combined_score'])
-        
-        # Collect unique top paths
+        # Calculate metrics for each path (feature totals for all paths in one pass),
+        # plus its dedup signature, computed once here rather than per sort order
+        totals = graph.path_feature_totals(all_paths).tolist()
+        path_metrics = [
+            (path, self._metrics_from_totals(*row, len(path)), tuple(seg.id for seg in path if seg.id))
+            for path, row in zip(all_paths, totals)
+        ]
+        
+        # Objective columns (lower is better): cost, latency, -reliability, combined score
+        n = len(path_metrics)
+        objectives = np.fromiter(
+            (
+                metrics[key]
+                for _, metrics, _ in path_metrics
+                for key in ('total_cost', 'total_latency', 'reliability', 'combined_score')
+            ),
+            dtype=np.float64,
+            count=4 * n
+        ).reshape(n, 4)
+        objectives[:, 2] *= -1.0
+        
+        # Collect unique top paths: best max_paths per objective, in objective order
         seen_paths = set()
         result = []
         
-        for path_list in [cost_sorted, latency_sorted, reliability_sorted, combined_sorted]:
-            for path, metrics in path_list[:max_paths]:
-                path_id = tuple(seg.id for seg in path if seg.id)
+        for column in range(4):
+            for i in top_k_order(objectives[:, column], max_paths):
+                path, metrics, path_id = path_metrics[i]
                 if path_id not in seen_paths:
                     seen_paths.add(path_id)
                     result.append((path, metrics))
@@ -234,12 +242,12 @@ class ORToolsSolver:
     def _calculate_edge_cost(self, segment: RouteSegment) -> float:
         """Calculate combined edge cost for optimization"""
         # Extract cost components
-        fee_percent = segment.cost.get('fee_percent', 0.0)
-        fixed_fee = segment.cost.get('fixed_fee', 0.0)
+        fee_percent = segment.fee_percent
+        fixed_fee = segment.fixed_fee
         
         # Normalize latency (convert minutes to cost-equivalent)
-        min_latency = segment.latency.get('min_minutes', 0)
-        max_latency = segment.latency.get('max_minutes', 0)
+        min_latency = segment.min_minutes
+        max_latency = segment.max_minutes
         avg_latency = (min_latency + max_latency) / 2 if max_latency > 0 else min_latency
         latency_cost = avg_latency / 60.0  # Convert minutes to hours, then normalize
         
@@ -261,18 +269,40 @@ class ORToolsSolver:
         total_fixed_fee = 0.0
         total_min_latency = 0
         total_max_latency = 0
-        reliability_scores = []
+        total_reliability = 0.0
         
         for segment in path:
-            total_cost_percent += segment.cost.get('fee_percent', 0.0)
-            total_fixed_fee += segment.cost.get('fixed_fee', 0.0)
-            total_min_latency += segment.latency.get('min_minutes', 0)
-            total_max_latency += segment.latency.get('max_minutes', 0)
-            reliability_scores.append(segment.reliability_score)
+            total_cost_percent += segment.fee_percent
+            total_fixed_fee += segment.fixed_fee
+            total_min_latency += segment.min_minutes
+            total_max_latency += segment.max_minutes
+            total_reliability += segment.reliability_score
         
         # Average reliability
-        avg_reliability = sum(reliability_scores) / len(reliability_scores) if reliability_scores else 0.0
-        
+        avg_reliability = total_reliability / len(path) if path else 0.0
+        
+        return self._metrics_from_totals(
+            total_cost_percent,
+            total_fixed_fee,
+            total_min_latency,
+            total_max_latency,
+            avg_reliability,
+            len(path)
+        )
+    
+    def _metrics_from_totals(
+        self,
+        total_cost_percent: float,
+        total_fixed_fee: float,
+        total_min_latency: float,
+        total_max_latency: float,
+        avg_reliability: float,
+        num_segments: int
+    ) -> Dict[str, float]:
+        """Build the path metrics dict from summed segment features"""
+        # Latencies are whole minutes; the float64 feature matrix must not leak into responses
+        total_min_latency = int(total_min_latency)
+        total_max_latency = int(total_max_latency)
         # Combined score (lower is better)
         avg_latency_hours = ((total_min_latency + total_max_latency) / 2) / 60.0
         combined_score = (
@@ -290,6 +320,6 @@ class ORToolsSolver:
             'max_latency': total_max_latency,
             'reliability': avg_reliability,
             'combined_score': combined_score,
-            'num_segments': len(path)
+            'num_segments': num_segments
         }
 
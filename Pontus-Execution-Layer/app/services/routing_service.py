@@ -3,22 +3,15 @@ Routing Service
 Orchestrates graph building, solvers, and decision layer to find optimal routes.
 """
 from typing import List, Dict, Optional, Tuple
+import importlib
 import logging
 
 from app.schemas.route_segment import RouteSegment
 from app.services.graph_builder import GraphBuilder, RouteGraph
-from app.services.ortools_solver import ORToolsSolver
 from app.services.argmax_decision import ArgMaxDecisionLayer
 
 logger = logging.getLogger(__name__)
 
-# Try to import CPLEX solver
-try:
-    from app.services.cplex_solver import CPLEXSolver, CPLEX_AVAILABLE
-except ImportError:
-    CPLEX_AVAILABLE = False
-    logger.info("CPLEX solver not available")
-
 
 class RoutingService:
     """Main routing service that coordinates all components"""
@@ -45,8 +38,17 @@ class RoutingService:
             beta: Speed weight in ArgMax decision
             gamma: Reliability weight in ArgMax decision
         """
+        # Solver modules pull in OR-Tools/CPLEX; import them only once a service is built
+        ortools_solver = importlib.import_module("app.services.ortools_solver")
+        try:
+            cplex_solver = importlib.import_module("app.services.cplex_solver")
+            cplex_available = cplex_solver.CPLEX_AVAILABLE
+        except ImportError:
+            cplex_available = False
+            logger.info("CPLEX solver not available")
+        
         self.graph_builder = GraphBuilder()
-        self.ortools_solver = ORToolsSolver(
+        self.ortools_solver = ortools_solver.ORToolsSolver(
             cost_weight=cost_weight,
             latency_weight=latency_weight,
             reliability_weight=reliability_weight
@@ -55,19 +57,19 @@ class RoutingService:
         # Auto-detect CPLEX if use_cplex is None, otherwise use specified preference
         if use_cplex is None:
             # Auto-detect: use CPLEX if available, otherwise use OR-Tools
-            self.use_cplex = CPLEX_AVAILABLE
+            self.use_cplex = cplex_available
             if self.use_cplex:
                 logger.info("CPLEX detected and will be used as primary solver (OR-Tools as fallback)")
             else:
                 logger.info("CPLEX not available, using OR-Tools as primary solver")
         else:
-            self.use_cplex = use_cplex and CPLEX_AVAILABLE
+            self.use_cplex = use_cplex and cplex_available
         
         # Initialize CPLEX solver if requested and available
         self.cplex_solver = None
         if self.use_cplex:
             try:
-                self.cplex_solver = CPLEXSolver(
+                self.cplex_solver = cplex_solver.CPLEXSolver(
                     cost_weight=cost_weight,
                     latency_weight=latency_weight,
                     reliability_weight=reliability_weight
@@ -59,10 +59,12 @@ class BackgroundTaskManager:
                 
                 all_fast_segments = crypto_segments + gas_segments + bridge_segments
                 
-                # Cache and persist
+                # Cache and persist (Redis and Postgres writes overlap)
                 if all_fast_segments:
-                    await self.aggregator.cache_segments(all_fast_segments)
-                    await self.aggregator.persist_segments(all_fast_segments)
+                    await asyncio.gather(
+                        self.aggregator.cache_segments(all_fast_segments),
+                        self.aggregator.persist_segments(all_fast_segments)
+                    )
                 
                 await asyncio.sleep(settings.crypto_gas_bridge_interval)
             except Exception as e:
@@ -80,10 +82,12 @@ class BackgroundTaskManager:
                 
                 all_slow_segments = fx_segments + bank_rail_segments + liquidity_segments
                 
-                # Cache and persist
+                # Cache and persist (Redis and Postgres writes overlap)
                 if all_slow_segments:
-                    await self.aggregator.cache_segments(all_slow_segments)
-                    await self.aggregator.persist_segments(all_slow_segments)
+                    await asyncio.gather(
+                        self.aggregator.cache_segments(all_slow_segments),
+                        self.aggregator.persist_segments(all_slow_segments)
+                    )
                 
                 await asyncio.sleep(settings.fx_bank_liquidity_interval)
             except Exception as e:
@@ -97,14 +101,11 @@ class BackgroundTaskManager:
                 # Fetch all segments
                 all_segments = await self.aggregator.fetch_all_segments()
                 
-                # Cache all segments
-                await self.aggregator.cache_segments(all_segments)
-                
-                # Persist segments
-                await self.aggregator.persist_segments(all_segments)
-                
-                # Create snapshot
-                await self.aggregator.persist_snapshot(all_segments)
+                # Cache all segments while persisting segments + snapshot in one transaction
+                await asyncio.gather(
+                    self.aggregator.cache_segments(all_segments),
+                    self.aggregator.persist_all(all_segments)
+                )
                 
                 # Wait 60 seconds before next full refresh
                 await asyncio.sleep(60)
@@ -124,10 +125,6 @@ class BackgroundTaskManager:
         if self.tasks:
             await asyncio.gather(*self.tasks, return_exceptions=True)
         
-        # Close aggregator
-        if self.aggregator:
-            await self.aggregator.close()
-        
         self.tasks = []
 
 
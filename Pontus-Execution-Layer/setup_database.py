@@ -18,6 +18,7 @@ if not os.getenv("DATABASE_URL"):
 
 from app.infra.database import init_db, AsyncSessionLocal
 from app.services.aggregator_service import AggregatorService
+from app.infra.http_client import close_http_client
 from app.config import settings
 
 print("=" * 80)
@@ -105,7 +106,7 @@ async def setup_database():
         await aggregator.persist_snapshot(all_segments)
         print("    ✅ Snapshot created")
         
-        await aggregator.close()
+        await close_http_client()
         
         print("\n✅ Database setup complete!")
         print(f"   Total route segments: {len(all_segments)}")
@@ -140,7 +141,7 @@ async def verify_setup():
         if snapshot:
             print(f"✅ Latest snapshot: {snapshot.get('count', 0)} segments")
         
-        await aggregator.close()
+        await close_http_client()
         
         if len(db_segments) > 0:
             print("\n✅ Database setup verified successfully!")
@@ -1,5 +1,5 @@
 #!/bin/bash
 # Start script for Render deployment
 cd "$(dirname "$0")" || exit 1
-exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
+exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}" --loop uvloop --http httptools --workers "${WEB_CONCURRENCY:-1}"
 
@@ -15,6 +15,7 @@ from app.clients import WiseClient, KrakenClient
 from app.config import settings
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
+from app.infra.http_client import close_http_client
 from app.services.execution.execution_service import ExecutionService
 from app.services.execution.advanced_execution_service import AdvancedExecutionService
 from app.schemas.execution import (
@@ -150,7 +151,7 @@ async def test_routing_engine():
         else:
             log_test("Route Segments Available", False, "No segments found (database may not be connected)")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Routing Engine Test", False, f"Error: {str(e)}")
@@ -198,7 +199,7 @@ async def test_basic_execution():
                 "error": result.error_message
             })
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Basic Execution", False, f"Error: {str(e)}")
@@ -289,7 +290,7 @@ async def test_cancellation():
         else:
             log_test("Execution Service Cancellation", False, "cancel_execution() method not found")
         
-        await aggregator_service.close()
+        await close_http_client()
     except Exception as e:
         log_test("Execution Service Cancellation", False, f"Error: {str(e)}")
 
@@ -330,7 +331,7 @@ async def test_pause_resume():
         else:
             log_test("Advanced Service Available", False, "AdvancedExecutionService not initialized")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Pause/Resume Test", False, f"Error: {str(e)}")
@@ -370,7 +371,7 @@ async def test_rerouting():
             else:
                 log_test("Re-routing Thresholds", False, "Thresholds not found")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Re-routing Test", False, f"Error: {str(e)}")
@@ -410,7 +411,7 @@ async def test_parallel_execution():
             else:
                 log_test("Parallel Execution Method", False, "Parallel execution method not found")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Parallel Execution Test", False, f"Error: {str(e)}")
@@ -463,7 +464,7 @@ async def test_modification():
         else:
             log_test("Execution Service Modification", False, "modify_transaction() method not found")
         
-        await aggregator_service.close()
+        await close_http_client()
     except Exception as e:
         log_test("Execution Service Modification", False, f"Error: {str(e)}")
 
@@ -19,6 +19,7 @@ try:
     from app.services.execution.execution_service import ExecutionService
     from app.services.routing_service import RoutingService
     from app.services.aggregator_service import AggregatorService
+    from app.infra.http_client import close_http_client
     from app.schemas.execution import RouteExecutionRequest
     EXECUTION_SERVICE_AVAILABLE = True
 except ImportError as e:
@@ -183,7 +184,7 @@ async def test_execution_service_simulation():
         # Restore original mode
         settings.execution_mode = original_mode
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Execution Service Test", False, f"Error: {str(e)}")
@@ -10,6 +10,7 @@ sys.path.insert(0, '/Users/arjundixit/Downloads/PontusExecution/Pontus-Execution
 
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
+from app.infra.http_client import close_http_client
 from app.services.execution.execution_service import ExecutionService
 from app.schemas.execution import RouteExecutionRequest
 
@@ -125,7 +126,7 @@ async def test_full_flow():
             cancel_result = await execution_service.cancel_execution(result.execution_id, cancel_pending=False)
             log_test("Cancellation Feature", "status" in cancel_result, "Cancellation method works")
         
-        await aggregator_service.close()
+        await close_http_client()
         
         print("\n" + "=" * 80)
         print("✅ FULL SYSTEM TEST COMPLETE")
@@ -14,6 +14,7 @@ from app.clients import WiseClient, KrakenClient
 from app.config import settings
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
+from app.infra.http_client import close_http_client
 from app.services.execution.execution_service import ExecutionService
 from app.schemas.execution import RouteExecutionRequest
 
@@ -262,7 +263,7 @@ async def test_execution_with_real_apis():
         else:
             log_test("Execution Service Test", False, "No segments available (database may not be connected)")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Execution Service Test", False, f"Error: {str(e)}")
@@ -318,7 +319,7 @@ async def test_advanced_features_with_apis():
         else:
             log_test("Parallel Execution Available", False, "Parallel execution not available")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Advanced Features Test", False, f"Error: {str(e)}")
@@ -14,6 +14,7 @@ from app.clients import WiseClient, KrakenClient
 from app.config import settings
 from app.services.routing_service import RoutingService
 from app.services.aggregator_service import AggregatorService
+from app.infra.http_client import close_http_client
 from app.services.execution.execution_service import ExecutionService
 from app.schemas.execution import RouteExecutionRequest
 
@@ -236,7 +237,7 @@ async def test_execution_service_integration():
         else:
             log_test("Bank Rail Executor API Integration", False, "Wise client not available")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Execution Service Integration", False, f"Error: {str(e)}")
@@ -328,7 +329,7 @@ async def test_simulation_execution():
                 "kraken_client": execution_service.kraken_client is not None,
                 "note": "Execution will work once segments are available"
             })
-            await aggregator_service.close()
+            await close_http_client()
             return
         
         request = RouteExecutionRequest(
@@ -362,7 +363,7 @@ async def test_simulation_execution():
         else:
             log_test("Simulation Execution", False, f"Unexpected status: {result.status.value}")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Simulation Execution", False, f"Error: {str(e)}")
@@ -421,7 +422,7 @@ async def test_advanced_features():
                 modify_result = await execution_service.modify_transaction(execution_id, segment_index=0, new_amount=5.0)
                 log_test("Modification Feature", "status" in modify_result or "error" in modify_result, "Modification method works")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Advanced Features Test", False, f"Error: {str(e)}")
@@ -476,7 +477,7 @@ async def test_parallel_execution():
             else:
                 log_test("Parallel Execution", False, f"Unexpected status: {result.status.value}")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("Parallel Execution Test", False, f"Error: {str(e)}")
@@ -538,7 +539,7 @@ async def test_ai_rerouting():
             else:
                 log_test("AI Re-routing Execution", False, f"Unexpected status: {result.status.value}")
         
-        await aggregator_service.close()
+        await close_http_client()
         
     except Exception as e:
         log_test("AI Re-routing Test", False, f"Error: {str(e)}")